@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import time
+
 from PySide6.QtCore import QObject, QTimer, Signal
 
 
+# Keystrokes closer together than this reuse the running debounce timer instead of restarting it.
+_RESTART_COALESCE_NS = 16_000_000
+
+
 class AutoSaveController(QObject):
     save_requested = Signal(str)
     dirty_changed = Signal(bool)
@@ -10,6 +16,7 @@ class AutoSaveController(QObject):
     def __init__(self, debounce_ms: int = 1200, periodic_ms: int = 15000, parent: QObject | None = None) -> None:
         super().__init__(parent)
         self._dirty = False
+        self._last_restart_ns = 0
 
         self._debounce_timer = QTimer(self)
         self._debounce_timer.setSingleShot(True)
@@ -26,9 +33,14 @@ class AutoSaveController(QObject):
         return self._dirty
 
     def mark_dirty(self) -> None:
+        now = time.monotonic_ns()
+        if self._dirty and now - self._last_restart_ns < _RESTART_COALESCE_NS and self._debounce_timer.isActive():
+            return
+
         if not self._dirty:
             self._dirty = True
             self.dirty_changed.emit(True)
+        self._last_restart_ns = now
         self._debounce_timer.start()
         if not self._periodic_timer.isActive():
             self._periodic_timer.start()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import re
 
 SECTION_DEFINITIONS: list[tuple[str, str]] = [
@@ -11,15 +12,89 @@ SECTION_DEFINITIONS: list[tuple[str, str]] = [
 
 _TITLE_RE = re.compile(r"(?m)^\s*#\s+(.+?)\s*$")
 _H2_RE = re.compile(r"(?m)^##\s+(.+?)\s*$")
-_IMAGE_LINE_RE = re.compile(r"^!\[[^\]]*]\([^)]+\)\s*$")
 
 
+def _normalize_newlines(text: str) -> str:
+    if "\r" not in text:
+        return text
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+@lru_cache(maxsize=64)
 def _normalize_heading(value: str) -> str:
     return re.sub(r"\s+", " ", value.strip()).casefold()
 
 
-_CANONICAL_BY_HEADING = {_normalize_heading(heading): key for heading, key in SECTION_DEFINITIONS}
-_CANONICAL_ORDER = [_normalize_heading(heading) for heading, _ in SECTION_DEFINITIONS]
+_CANONICAL_SLOT_BY_HEADING = {
+    _normalize_heading(heading): slot for slot, (heading, _key) in enumerate(SECTION_DEFINITIONS)
+}
+# Headings written by to_markdown only differ in case at most, so try them before normalizing whitespace.
+_CANONICAL_SLOT_BY_EXACT_HEADING = {heading.casefold(): slot for slot, (heading, _key) in enumerate(SECTION_DEFINITIONS)}
+
+
+def _template_body(value: str) -> str:
+    body = value.strip("\n")
+    return f"{body}\n\n" if body else "\n"
+
+
+_DOCUMENT_TEMPLATE = (
+    "# {title}\n\n"
+    + "".join(f"## {heading}\n{{{key}}}" for heading, key in SECTION_DEFINITIONS)
+    + "{extras}"
+)
+
+
+def _parse_structured(text: str, prefix_start: int) -> tuple[str, str, str, str] | None:
+    h2_iter = _H2_RE.finditer(text)
+    match = next(h2_iter, None)
+    if match is None:
+        return None
+
+    sections: list[str | None] = [None] * len(SECTION_DEFINITIONS)
+    extras_chunks: list[str] = []
+
+    prefix: str = text[prefix_start : match.start()]
+    if prefix.strip():
+        extras_chunks.append(prefix.strip("\n"))
+
+    last_slot: int = -1
+    exact_slot = _CANONICAL_SLOT_BY_EXACT_HEADING.get
+    normalized_slot = _CANONICAL_SLOT_BY_HEADING.get
+
+    while match is not None:
+        next_match = next(h2_iter, None)
+        heading: str = match.group(1).strip()
+        body_start: int = match.end()
+        body_end: int = next_match.start() if next_match is not None else len(text)
+        # Trim blank lines by moving the bounds so each body is copied out of the document once.
+        while body_start < body_end and text[body_start] == "\n":
+            body_start += 1
+        while body_end > body_start and text[body_end - 1] == "\n":
+            body_end -= 1
+        body: str = text[body_start:body_end]
+        match = next_match
+
+        slot: int | None = exact_slot(heading.casefold())
+        if slot is None:
+            slot = normalized_slot(_normalize_heading(heading))
+        if slot is not None and sections[slot] is None:
+            if slot < last_slot:
+                return None
+            sections[slot] = body
+            last_slot = slot
+            continue
+
+        extra_section: str = f"## {heading}\n"
+        if body:
+            extra_section += f"{body.rstrip()}\n"
+        extras_chunks.append(extra_section.strip("\n"))
+
+    block1, block2, block3 = sections
+    if block1 is None or block2 is None or block3 is None:
+        return None
+
+    extras: str = "\n\n".join(chunk for chunk in extras_chunks if chunk.strip())
+    return block1, block2, block3, extras
 
 
 @dataclass(slots=True)
@@ -38,62 +113,20 @@ class TradingPlan:
 
     @classmethod
     def from_markdown(cls, markdown: str, fallback_title: str = "Без названия") -> "TradingPlan":
-        text = markdown.replace("\r\n", "\n").replace("\r", "\n")
+        text = _normalize_newlines(markdown)
         title_match = _TITLE_RE.search(text)
         title = title_match.group(1).strip() if title_match else fallback_title
 
-        h2_matches = list(_H2_RE.finditer(text))
-        if not h2_matches:
-            return cls(title=title, raw_markdown=text, structured=False)
-
-        sections: dict[str, str] = {}
-        extras_chunks: list[str] = []
-
-        prefix_start = title_match.end() if title_match else 0
-        prefix = text[prefix_start : h2_matches[0].start()]
-        if prefix.strip():
-            extras_chunks.append(prefix.strip("\n"))
-
-        encountered_canonical: list[str] = []
-
-        for index, match in enumerate(h2_matches):
-            heading = match.group(1).strip()
-            normalized = _normalize_heading(heading)
-            body_start = match.end()
-            body_end = h2_matches[index + 1].start() if index + 1 < len(h2_matches) else len(text)
-            body = text[body_start:body_end].strip("\n")
-
-            canonical_key = _CANONICAL_BY_HEADING.get(normalized)
-            if canonical_key is not None and canonical_key not in sections:
-                sections[canonical_key] = body
-                encountered_canonical.append(normalized)
-                continue
-
-            extra_section = f"## {heading}\n"
-            if body:
-                extra_section += f"{body.rstrip()}\n"
-            extras_chunks.append(extra_section.strip("\n"))
-
-        structured = all(key in sections for _, key in SECTION_DEFINITIONS)
-        if structured:
-            position = -1
-            for canonical_heading in _CANONICAL_ORDER:
-                try:
-                    next_pos = encountered_canonical.index(canonical_heading, position + 1)
-                except ValueError:
-                    structured = False
-                    break
-                position = next_pos
-
-        if not structured:
+        parsed = _parse_structured(text, title_match.end() if title_match else 0)
+        if parsed is None:
             return cls(title=title, raw_markdown=text, structured=False)
 
-        extras = "\n\n".join(chunk for chunk in extras_chunks if chunk.strip())
+        block1, block2, block3, extras = parsed
         return cls(
             title=title,
-            block1=sections.get("block1", ""),
-            block2=sections.get("block2", ""),
-            block3=sections.get("block3", ""),
+            block1=block1,
+            block2=block2,
+            block3=block3,
             extras=extras,
             raw_markdown=text,
             structured=True,
@@ -112,30 +145,34 @@ class TradingPlan:
         )
 
     def to_markdown(self) -> str:
-        title = self.title.strip() or "Без названия"
-        lines: list[str] = [f"# {title}", ""]
-
-        for heading, key in SECTION_DEFINITIONS:
-            body = getattr(self, key, "").strip("\n")
-            lines.append(f"## {heading}")
-            if body:
-                lines.append(body)
-            lines.append("")
-
         extras = self.extras.strip("\n")
-        if extras:
-            lines.append(extras)
-            lines.append("")
-
-        return "\n".join(lines).rstrip() + "\n"
+        return _DOCUMENT_TEMPLATE.format_map(
+            {
+                "title": self.title.strip() or "Без названия",
+                "block1": _template_body(self.block1),
+                "block2": _template_body(self.block2),
+                "block3": _template_body(self.block3),
+                "extras": f"{extras}\n\n" if extras else "",
+            }
+        ).rstrip() + "\n"
 
 
 def apply_title_to_markdown(markdown: str, title: str) -> str:
     clean_title = title.strip() or "Без названия"
-    text = markdown.replace("\r\n", "\n").replace("\r", "\n")
-
-    if _TITLE_RE.search(text):
-        replaced = _TITLE_RE.sub(f"# {clean_title}", text, count=1)
+    text = _normalize_newlines(markdown)
+
+    title_match = _TITLE_RE.search(text)
+    if title_match:
+        title_line = f"# {clean_title}"
+        # The trailing \s* can run into the blank line after the title; replace only the title line itself.
+        line_end = text.find("\n", title_match.end(1), title_match.end())
+        if line_end == -1:
+            line_end = title_match.end()
+        if text[title_match.start() : line_end] == title_line:
+            if text.endswith("\n") and not text[-2:-1].isspace():
+                return text
+            return text.rstrip() + "\n"
+        replaced = text[: title_match.start()] + title_line + text[line_end:]
         return replaced.rstrip() + "\n"
 
     if text.strip():
@@ -144,12 +181,30 @@ def apply_title_to_markdown(markdown: str, title: str) -> str:
     return f"# {clean_title}\n\n"
 
 
+def extract_title(markdown: str, fallback: str = "Без названия") -> str:
+    # Same search as TradingPlan.from_markdown, so the preview and the loaded plan agree on the title.
+    title_match = _TITLE_RE.search(_normalize_newlines(markdown))
+    return title_match.group(1).strip() if title_match else fallback
+
+
+def _is_image_line(line: str) -> bool:
+    # Same as a full-line r"!\[[^\]]*]\([^)]+\)" match: exactly one link and nothing after it.
+    if not line.startswith("![") or not line.endswith(")"):
+        return False
+    alt_end = line.find("]", 2)
+    return (
+        alt_end != -1
+        and line.startswith("(", alt_end + 1)
+        and line.find(")", alt_end + 2) == len(line) - 1 > alt_end + 2
+    )
+
+
 def find_first_image_without_text(markdown_block: str) -> int | None:
     lines = markdown_block.splitlines()
 
     for index, raw_line in enumerate(lines):
         line = raw_line.strip()
-        if not _IMAGE_LINE_RE.match(line):
+        if not _is_image_line(line):
             continue
 
         has_text_below = False
@@ -157,7 +212,7 @@ def find_first_image_without_text(markdown_block: str) -> int | None:
             next_line = next_raw.strip()
             if not next_line:
                 continue
-            if _IMAGE_LINE_RE.match(next_line):
+            if _is_image_line(next_line):
                 break
             has_text_below = True
             break
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+import itertools
 import os
 from pathlib import Path
+import threading
 from uuid import uuid4
 
 from ..settings import get_data_dir
@@ -12,7 +14,11 @@ from ..settings import get_data_dir
 @dataclass(slots=True)
 class PlanFileInfo:
     path: Path
-    modified_at: datetime
+    mtime: float
+
+    @property
+    def modified_at(self) -> datetime:
+        return datetime.fromtimestamp(self.mtime)
 
 
 def list_markdown_files(directory: Path) -> list[PlanFileInfo]:
@@ -20,77 +26,197 @@ def list_markdown_files(directory: Path) -> list[PlanFileInfo]:
         return []
 
     entries: list[PlanFileInfo] = []
-    seen_paths: set[Path] = set()
-
-    def add_file(file_path: Path) -> None:
-        if not file_path.is_file():
-            return
-        resolved = file_path.resolve()
-        if resolved in seen_paths:
-            return
+    seen_paths: set[str] = set()
+    # Directory symlinks are not followed (same as Path.rglob), so joining entry names
+    # onto the resolved root yields canonical paths without a resolve() per file.
+    pending: list[tuple[str, str]] = [(str(directory), os.path.realpath(directory))]
+
+    while pending:
+        current_dir, current_real = pending.pop()
         try:
-            stat = file_path.stat()
+            with os.scandir(current_dir) as iterator:
+                dir_entries = list(iterator)
         except OSError:
-            return
-        seen_paths.add(resolved)
-        entries.append(PlanFileInfo(path=file_path, modified_at=datetime.fromtimestamp(stat.st_mtime)))
+            continue
 
-    for file_path in directory.rglob("*.md"):
-        add_file(file_path)
+        for entry in dir_entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, os.path.join(current_real, entry.name)))
+                    continue
+                if not os.path.normcase(entry.name).endswith(".md") or not entry.is_file():
+                    continue
+                real_path = (
+                    os.path.realpath(entry.path)
+                    if entry.is_symlink()
+                    else os.path.join(current_real, entry.name)
+                )
+                if real_path in seen_paths:
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            seen_paths.add(real_path)
+            entries.append(PlanFileInfo(path=Path(entry.path), mtime=stat.st_mtime))
 
-    entries.sort(key=lambda item: (-item.modified_at.timestamp(), item.path.name.casefold()))
+    entries.sort(key=lambda item: (-item.mtime, item.path.name.casefold()))
     return entries
 
 
 def read_markdown(path: Path) -> str:
-    encodings = ("utf-8", "utf-8-sig", "cp1251")
-    for encoding in encodings:
+    _wait_for_background_writes()
+    data = path.read_bytes()
+    for encoding in ("utf-8-sig", "cp1251"):
         try:
-            return path.read_text(encoding=encoding)
+            return data.decode(encoding)
         except UnicodeDecodeError:
             continue
-    return path.read_text(encoding="utf-8", errors="replace")
+    return data.decode("utf-8", errors="replace")
+
+
+_TEMP_FILE_COUNTER = itertools.count()
+_TEMP_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
 
 
 def atomic_write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    temp_name = f".{path.name}.{os.getpid()}.{uuid4().hex}.tmp"
+    # The random part guards against leftovers of a crashed process that had the same pid.
+    temp_name = f".{path.name}.{os.getpid()}.{next(_TEMP_FILE_COUNTER):x}{os.urandom(4).hex()}.tmp"
     temp_path = path.parent / temp_name
+    data = memoryview(text.encode("utf-8"))
+    replaced = False
 
     try:
-        with temp_path.open("w", encoding="utf-8", newline="\n") as file:
-            file.write(text)
-            file.flush()
-            os.fsync(file.fileno())
+        fd = os.open(temp_path, _TEMP_FILE_FLAGS, 0o644)
+        try:
+            written = 0
+            while written < len(data):
+                written += os.write(fd, data[written:])
+            os.fsync(fd)
+        finally:
+            os.close(fd)
         os.replace(temp_path, path)
+        replaced = True
     finally:
-        if temp_path.exists():
+        if not replaced:
             try:
                 temp_path.unlink()
             except OSError:
                 pass
 
 
+class _BackgroundWriter:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._pending: dict[Path, str] = {}
+        self._errors: dict[Path, OSError] = {}
+        self._writing = False
+        self._thread: threading.Thread | None = None
+
+    def submit(self, path: Path, text: str) -> None:
+        with self._condition:
+            # Only the latest text per path matters; older queued versions are dropped unwritten.
+            self._pending[path] = text
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="markdown-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def take_error(self, path: Path) -> OSError | None:
+        with self._condition:
+            return self._errors.pop(path, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                path = next(iter(self._pending))
+                text = self._pending.pop(path)
+                self._writing = True
+
+            error: OSError | None = None
+            try:
+                atomic_write_text(path=path, text=text)
+            except OSError as exc:
+                error = exc
+
+            with self._condition:
+                if error is not None:
+                    self._errors[path] = error
+                else:
+                    self._errors.pop(path, None)
+                self._writing = False
+                self._condition.notify_all()
+
+
+_BACKGROUND_WRITER = _BackgroundWriter()
+# Callers wait on the GUI thread; a stalled disk must surface as an error instead of a frozen window.
+_FLUSH_TIMEOUT_SECONDS = 10.0
+
+
+def _wait_for_background_writes() -> None:
+    if not _BACKGROUND_WRITER.flush(_FLUSH_TIMEOUT_SECONDS):
+        raise TimeoutError("Фоновая запись файла не завершилась вовремя.")
+
+
 def save_markdown(path: Path, markdown: str) -> None:
+    _wait_for_background_writes()
     atomic_write_text(path=path, text=markdown)
+    # This write supersedes whatever a failed background write left behind.
+    _BACKGROUND_WRITER.take_error(path)
+
+
+def save_markdown_in_background(path: Path, markdown: str) -> OSError | None:
+    previous_error = _BACKGROUND_WRITER.take_error(path)
+    _BACKGROUND_WRITER.submit(path, markdown)
+    return previous_error
+
+
+def flush_pending_writes(timeout: float | None = _FLUSH_TIMEOUT_SECONDS) -> bool:
+    return _BACKGROUND_WRITER.flush(timeout)
+
+
+def take_background_error(path: Path) -> OSError | None:
+    return _BACKGROUND_WRITER.take_error(path)
 
 
 def build_draft_path(preferred_directory: Path | None) -> Path:
     base_dir = preferred_directory if preferred_directory else get_data_dir() / "drafts"
     base_dir.mkdir(parents=True, exist_ok=True)
 
-    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
     candidate = base_dir / f"_draft_{stamp}.md"
-    counter = 1
+    try:
+        _reserve_path(candidate)
+    except FileExistsError:
+        candidate = base_dir / f"_draft_{stamp}_{uuid4().hex[:8]}.md"
+        _reserve_path(candidate)
+    return candidate
 
-    while candidate.exists():
-        counter += 1
-        candidate = base_dir / f"_draft_{stamp}_{counter}.md"
 
-    return candidate
+def _reserve_path(path: Path) -> None:
+    os.close(os.open(path, _TEMP_FILE_FLAGS, 0o644))
+
+
+def release_draft_path(path: Path) -> None:
+    # Drop a name reserved by build_draft_path whose first save never landed.
+    try:
+        if path.stat().st_size == 0:
+            path.unlink()
+    except OSError:
+        pass
 
 
 def save_draft(markdown: str, preferred_directory: Path | None) -> Path:
     draft_path = build_draft_path(preferred_directory=preferred_directory)
-    save_markdown(path=draft_path, markdown=markdown)
+    try:
+        save_markdown(path=draft_path, markdown=markdown)
+    except OSError:
+        release_draft_path(draft_path)
+        raise
     return draft_path
@@ -5,7 +5,7 @@ import re
 import sys
 from pathlib import Path
 
-from PySide6.QtGui import QIcon
+from PySide6.QtGui import QIcon, QPixmapCache
 from PySide6.QtWidgets import QApplication
 
 if __package__ in (None, ""):
@@ -18,6 +18,8 @@ else:
 
 
 _APP_ID = re.sub(r"[^A-Za-z0-9_.]", "_", f"{APP_NAME}.TradingPlans")
+# Screenshot previews are shared through QPixmapCache; the 10 MB default fits barely one of them.
+_PIXMAP_CACHE_LIMIT_KB = 64 * 1024
 
 
 def _set_windows_app_id() -> None:
@@ -44,6 +46,7 @@ def main() -> int:
     app.setApplicationName(APP_NAME)
     app.setOrganizationName(APP_NAME)
     app.setStyle("Fusion")
+    QPixmapCache.setCacheLimit(_PIXMAP_CACHE_LIMIT_KB)
 
     icon = _load_app_icon()
     if not icon.isNull():
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 import json
 import os
 from pathlib import Path
 import sys
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 APP_NAME = "Censor"
 PLANS_DIRECTORY_NAME = "Censor Plans"
@@ -19,6 +26,7 @@ def is_plans_directory_name(name: str) -> bool:
     return normalized == PLANS_DIRECTORY_NAME.casefold() or normalized in LEGACY_PLANS_DIRECTORY_NAMES
 
 
+@lru_cache(maxsize=4)
 def get_config_dir(app_name: str = APP_NAME) -> Path:
     home = Path.home()
     if os.name == "nt":
@@ -30,6 +38,7 @@ def get_config_dir(app_name: str = APP_NAME) -> Path:
     return base / app_name.lower()
 
 
+@lru_cache(maxsize=4)
 def get_data_dir(app_name: str = APP_NAME) -> Path:
     home = Path.home()
     if os.name == "nt":
@@ -49,6 +58,7 @@ def _ensure_directory(path: Path) -> bool:
     return path.exists() and path.is_dir()
 
 
+@lru_cache(maxsize=4)
 def get_default_workspace_dir(app_name: str = APP_NAME) -> Path:
     candidates: list[Path] = []
 
@@ -82,6 +92,32 @@ def get_default_workspace_dir(app_name: str = APP_NAME) -> Path:
     return fallback
 
 
+_SETTINGS_SCHEMA: tuple[tuple[str, type, Callable[[Any], bool] | None], ...] = (
+    ("last_directory", str, None),
+    ("autosave_debounce_ms", int, lambda value: value >= 100),
+    ("autosave_periodic_ms", int, lambda value: value >= 1000),
+    ("ui_theme", str, lambda value: value in ("dark", "light")),
+    ("sidebar_visible", bool, None),
+    ("preview_visible", bool, None),
+    ("sidebar_width", int, lambda value: 120 <= value <= 1200),
+    ("preview_size", int, lambda value: 160 <= value <= 1600),
+    ("preview_orientation", str, lambda value: value in ("vertical", "horizontal")),
+    ("last_open_file", str, None),
+)
+
+
+def _load_json(raw: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _dump_json(payload: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 @dataclass(slots=True)
 class AppSettings:
     last_directory: str = ""
@@ -103,48 +139,23 @@ class AppSettings:
             return cls()
 
         try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            data = _load_json(path.read_bytes())
+        except (ValueError, OSError):
+            return cls()
+
+        if not isinstance(data, dict):
             return cls()
 
         settings = cls()
-        if isinstance(data.get("last_directory"), str):
-            settings.last_directory = data["last_directory"]
+        for name, value_type, is_valid in _SETTINGS_SCHEMA:
+            value = data.get(name)
+            if isinstance(value, value_type) and (is_valid is None or is_valid(value)):
+                setattr(settings, name, value)
 
         recent_files = data.get("recent_files")
         if isinstance(recent_files, list):
             settings.recent_files = [str(item) for item in recent_files if isinstance(item, str)]
 
-        debounce = data.get("autosave_debounce_ms")
-        periodic = data.get("autosave_periodic_ms")
-
-        if isinstance(debounce, int) and debounce >= 100:
-            settings.autosave_debounce_ms = debounce
-        if isinstance(periodic, int) and periodic >= 1000:
-            settings.autosave_periodic_ms = periodic
-
-        if data.get("ui_theme") in ("dark", "light"):
-            settings.ui_theme = str(data["ui_theme"])
-
-        if isinstance(data.get("sidebar_visible"), bool):
-            settings.sidebar_visible = bool(data["sidebar_visible"])
-        if isinstance(data.get("preview_visible"), bool):
-            settings.preview_visible = bool(data["preview_visible"])
-
-        sidebar_width = data.get("sidebar_width")
-        if isinstance(sidebar_width, int) and 120 <= sidebar_width <= 1200:
-            settings.sidebar_width = sidebar_width
-
-        preview_size = data.get("preview_size")
-        if isinstance(preview_size, int) and 160 <= preview_size <= 1600:
-            settings.preview_size = preview_size
-
-        if data.get("preview_orientation") in ("vertical", "horizontal"):
-            settings.preview_orientation = str(data["preview_orientation"])
-
-        if isinstance(data.get("last_open_file"), str):
-            settings.last_open_file = str(data["last_open_file"])
-
         return settings
 
     def save(self) -> None:
@@ -165,11 +176,14 @@ class AppSettings:
             "preview_orientation": self.preview_orientation,
             "last_open_file": self.last_open_file,
         }
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        path.write_bytes(_dump_json(payload))
 
     def touch_recent_file(self, path: str, max_items: int = 10) -> None:
         normalized = str(path)
-        if normalized in self.recent_files:
-            self.recent_files.remove(normalized)
-        self.recent_files.insert(0, normalized)
-        self.recent_files = self.recent_files[:max_items]
+        recent_files = self.recent_files
+        try:
+            recent_files.remove(normalized)
+        except ValueError:
+            pass
+        recent_files.insert(0, normalized)
+        del recent_files[max_items:]
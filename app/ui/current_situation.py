@@ -1,17 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import pairwise
 from pathlib import Path
 import re
 
 from PySide6.QtCore import QTimer, QStringListModel, Qt, Signal
-from PySide6.QtGui import QPixmap, QTextCursor
+from PySide6.QtGui import QImage, QPixmap, QTextCursor
 from PySide6.QtWidgets import (
     QComboBox,
     QCompleter,
     QFileDialog,
     QFrame,
-    QGridLayout,
     QHBoxLayout,
     QLabel,
     QPlainTextEdit,
@@ -24,6 +25,7 @@ from PySide6.QtWidgets import (
 )
 
 from .image_clipboard import image_path_from_clipboard
+from .image_loader import image_loader
 
 TIMEFRAME_OPTIONS = ["m1", "m5", "m15", "h1", "h4", "D1", "W1", "M1"]
 ELEMENT_OPTIONS = [
@@ -35,118 +37,225 @@ ELEMENT_OPTIONS = [
 ]
 ZONE_OPTIONS = ["Premium", "Equilibrium", "Discount"]
 
-_LINE_1_IN_RE = re.compile(r"^IN\s+([+-])\s+([A-Za-z0-9]+)\s+([A-Za-z][A-Za-z0-9_-]*)$", re.IGNORECASE)
-_LINE_1_RANGE_ONE_RE = re.compile(
-    r"^RANGE\s+([+-])\s+([A-Za-z0-9]+)\s+([A-Za-z][A-Za-z0-9_-]*)\s+(UP|DOWN)$",
-    re.IGNORECASE,
-)
-_LINE_1_RANGE_TWO_RE = re.compile(
-    r"^RANGE\s+([+-])\s+([A-Za-z0-9]+)\s+([A-Za-z][A-Za-z0-9_-]*)\s+([+-])\s+([A-Za-z0-9]+)\s+([A-Za-z][A-Za-z0-9_-]*)$",
-    re.IGNORECASE,
+# Image links (group 1: path) and NOTATION comments (group 2: body), found in one scan of the block.
+_BLOCK_TOKEN_RE = re.compile(r"!\[[^\]\n]*+]\(([^)\n]++)\)|<!--\s*NOTATION\s*(.*?)\s*-->", re.IGNORECASE | re.DOTALL | re.ASCII)
+# Group 1 is a "**TF:**" line, group 2 a bare "TF:" line.
+_TF_ANY_RE = re.compile(r"(?mi)^(?:\*\*TF:\*\*\s*(.+?)|TF:\s*(.+?))\s*$")
+_TF_BOLD_RE = re.compile(r"(?mi)^\*\*TF:\*\*\s*(.+?)\s*$")
+_TF_LINE_PATTERN = r"^(?:\*\*TF:\*\*|TF:)\s*.+$"
+# TF lines and "---" separators left between entries once images and the notation are cut out.
+# A separator also swallows the whitespace and TF lines after it, exactly as when TF lines were removed first.
+_MANUAL_NOISE_RE = re.compile(rf"(?mi){_TF_LINE_PATTERN}|^---+(?:\s|{_TF_LINE_PATTERN})*$")
+
+
+def _find_timeframe(chunk: str) -> str:
+    match = _TF_ANY_RE.search(chunk)
+    if match is None:
+        return ""
+    if match.group(1) is not None:
+        return match.group(1).strip()
+    # A later "**TF:**" line still wins over this bare one; it may even sit inside the bare match,
+    # since \s* runs across empty lines, so look again from the next line rather than after the match.
+    bold_match = _TF_BOLD_RE.search(chunk, match.start() + 1)
+    return (bold_match.group(1) if bold_match else match.group(2)).strip()
+
+
+_TIMEFRAME_TOKENS = frozenset(item.upper() for item in TIMEFRAME_OPTIONS)
+_ELEMENT_TOKENS = frozenset(item.casefold() for item in ELEMENT_OPTIONS)
+_SIGN_TOKENS = frozenset(("+", "-"))
+_ACTUAL_PREV_TOKENS = frozenset(("actual", "prev"))
+_DIRECTION_TOKENS = frozenset(("up", "down"))
+_ZONE_BY_TOKEN = {zone.casefold(): zone for zone in ZONE_OPTIONS}
+
+
+def _is_timeframe_token(token: str) -> bool:
+    return token.isascii() and token.isalnum()
+
+
+def _is_element_token(token: str) -> bool:
+    return token.isascii() and token[:1].isalpha() and token.replace("_", "").replace("-", "").isalnum()
+
+
+def _is_element_ref(tokens: list[str], start: int) -> bool:
+    return (
+        tokens[start] in _SIGN_TOKENS
+        and _is_timeframe_token(tokens[start + 1])
+        and _is_element_token(tokens[start + 2])
+    )
+
+
+def _is_range_prefix(tokens: list[str], start: int) -> bool:
+    # "Actual/Prev +/- TF" typed so far, i.e. the point where the optional DR token goes.
+    return (
+        tokens[start].casefold() in _ACTUAL_PREV_TOKENS
+        and tokens[start + 1] in _SIGN_TOKENS
+        and tokens[start + 2].upper() in _TIMEFRAME_TOKENS
+    )
+
+
+def _parse_line1(tokens: list[str]) -> tuple[str, int] | None:
+    if not tokens:
+        return None
+    match tokens[0].upper(), len(tokens):
+        case "IN", 4 if _is_element_ref(tokens, 1):
+            return "IN", 1
+        case "RANGE", 5 if _is_element_ref(tokens, 1) and tokens[4].casefold() in _DIRECTION_TOKENS:
+            return "RANGE", 1
+        case "RANGE", 7 if _is_element_ref(tokens, 1) and _is_element_ref(tokens, 4):
+            return "RANGE", 2
+    return None
+
+
+def _parse_range_clause(clause_text: str) -> tuple[str, str, str, str] | None:
+    tokens = clause_text.split()
+    if len(tokens) == 5:
+        if tokens[3].upper() != "DR":
+            return None
+    elif len(tokens) != 4:
+        return None
+
+    actual_prev, sign, timeframe = tokens[0], tokens[1], tokens[2]
+    zone = _ZONE_BY_TOKEN.get(tokens[-1].casefold())
+    if (
+        zone is None
+        or actual_prev.casefold() not in _ACTUAL_PREV_TOKENS
+        or sign not in _SIGN_TOKENS
+        or not _is_timeframe_token(timeframe)
+    ):
+        return None
+    return actual_prev.upper(), sign, timeframe.upper(), zone
+
+
+_ACTUAL_PREV_TEXT = {"ACTUAL": "актуального", "PREV": "предыдущего"}
+_IN_TEMPLATE = "Цена находится внутри {element_ref}. Данный {element} находится в отметках {range_ref}."
+_RANGE_ONE_TEMPLATE = (
+    "Цена устанавливает {extreme}. Ближайшая опорная область - {element_ref}, расположенный в отметках {range_ref}."
 )
-_RANGE_CLAUSE_RE = re.compile(
-    r"^(Actual|Prev)\s+([+-])\s+([A-Za-z0-9]+)\s+(?:DR\s+)?(Premium|Equilibrium|Discount)$",
-    re.IGNORECASE,
+_RANGE_TWO_TEMPLATE = (
+    "Цена находится в диапазоне между {element_ref_1}, расположенного в отметках {range_ref_1}, "
+    "и {element_ref_2}, расположенного в отметках {range_ref_2}."
 )
-_IMAGE_RE = re.compile(r"!\[[^\]]*]\(([^)]+)\)")
-_NOTATION_COMMENT_RE = re.compile(r"(?is)<!--\s*NOTATION\s*(.*?)\s*-->")
 
 
-def notation_to_text(notation: str) -> tuple[str | None, str | None]:
-    lines = [line.strip() for line in notation.splitlines() if line.strip()]
-    if len(lines) != 2:
-        return None, "Нотация должна содержать ровно 2 непустые строки."
-
-    def actual_prev_text(value: str) -> str:
-        return "актуального" if value.upper() == "ACTUAL" else "предыдущего"
+def _element_ref(tokens: list[str], start: int) -> str:
+    return f"[{tokens[start]}{tokens[start + 1].upper()} {tokens[start + 2]}]"
 
-    def element_text(sign: str, timeframe: str, element: str) -> str:
-        return f"[{sign}{timeframe.upper()} {element}]"
 
-    def dr_text(sign: str, timeframe: str) -> str:
-        return f"[{sign}{timeframe.upper()} DR]"
+def _range_ref(clause: tuple[str, str, str, str]) -> str:
+    actual_prev, sign, timeframe, zone = clause
+    return f"{zone} {_ACTUAL_PREV_TEXT[actual_prev]} [{sign}{timeframe} DR]"
 
-    def normalize_zone(value: str) -> str:
-        lookup = {"premium": "Premium", "equilibrium": "Equilibrium", "discount": "Discount"}
-        return lookup.get(value.casefold(), value)
 
-    def parse_range_clause(clause_text: str) -> tuple[tuple[str, str, str, str] | None, str | None]:
-        match = _RANGE_CLAUSE_RE.match(clause_text.strip())
-        if not match:
-            return None, "Формат диапазона: Actual/Prev +/- TF DR Premium/Equilibrium/Discount"
-        actual_prev, direction_sign, timeframe, zone = match.groups()
-        return (
-            actual_prev.upper(),
-            direction_sign,
-            timeframe.upper(),
-            normalize_zone(zone),
-        ), None
+# Called for every notation keystroke, autosave and preview; identical notations are very common.
+@lru_cache(maxsize=512)
+def notation_to_text(notation: str) -> tuple[str | None, str | None]:
+    lines = [line.strip() for line in notation.splitlines() if line.strip()]
+    if len(lines) != 2:
+        return None, "Нотация должна содержать ровно 2 непустые строки."
 
-    line_1 = lines[0]
+    tokens = lines[0].split()
     line_2 = lines[1]
+    parsed = _parse_line1(tokens)
+    if parsed is None:
+        return None, "1 строка: IN +/- TF Element или RANGE +/- TF Element (UP/DOWN или +/- TF Element)"
 
-    in_match = _LINE_1_IN_RE.match(line_1)
-    if in_match:
-        sign_1, tf_1, element = in_match.groups()
-        clause_data, clause_error = parse_range_clause(line_2)
-        if clause_error:
+    mode, element_count = parsed
+    if mode == "IN":
+        clause = _parse_range_clause(line_2)
+        if clause is None:
             return None, "2 строка: Actual/Prev +/- TF DR Premium/Equilibrium/Discount"
-        assert clause_data is not None
-        actual_prev, sign_2, tf_2, zone = clause_data
-        range_desc = dr_text(sign_2, tf_2)
-        text = (
-            f"Цена находится внутри {element_text(sign_1, tf_1, element)}. "
-            f"Данный {element} находится в отметках {zone} {actual_prev_text(actual_prev)} "
-            f"{range_desc}."
+        text = _IN_TEMPLATE.format(
+            element_ref=_element_ref(tokens, 1),
+            element=tokens[3],
+            range_ref=_range_ref(clause),
         )
         return text, None
 
-    range_two_match = _LINE_1_RANGE_TWO_RE.match(line_1)
-    if range_two_match:
-        sign_1, tf_1, element_1, sign_2, tf_2, element_2 = range_two_match.groups()
-        first_element_desc = element_text(sign_1, tf_1, element_1)
-        parts = [part.strip() for part in re.split(r"\s*[|;]\s*", line_2) if part.strip()]
+    if element_count == 2:
+        # _parse_range_clause splits on whitespace itself, so the halves need no stripping.
+        parts = [part for part in line_2.replace(";", "|").split("|") if part and not part.isspace()]
         if len(parts) != 2:
             return None, "2 строка для RANGE с 2 элементами: <диапазон 1> | <диапазон 2>"
 
-        clause_1, error_1 = parse_range_clause(parts[0])
-        clause_2, error_2 = parse_range_clause(parts[1])
-        if error_1 or error_2:
+        clause_1 = _parse_range_clause(parts[0])
+        clause_2 = _parse_range_clause(parts[1])
+        if clause_1 is None or clause_2 is None:
             return None, "2 строка для RANGE: Actual/Prev +/- TF DR Premium/Equilibrium/Discount | Actual/Prev +/- TF DR Premium/Equilibrium/Discount"
-        assert clause_1 is not None and clause_2 is not None
-
-        range_1_text = f"{clause_1[3]} {actual_prev_text(clause_1[0])} {dr_text(clause_1[1], clause_1[2])}"
-        range_2_text = f"{clause_2[3]} {actual_prev_text(clause_2[0])} {dr_text(clause_2[1], clause_2[2])}"
-        second_element_desc = element_text(sign_2, tf_2, element_2)
-        text = (
-            f"Цена находится в диапазоне между {first_element_desc}, расположенного в отметках {range_1_text}, "
-            f"и {second_element_desc}, расположенного в отметках {range_2_text}."
+
+        text = _RANGE_TWO_TEMPLATE.format(
+            element_ref_1=_element_ref(tokens, 1),
+            range_ref_1=_range_ref(clause_1),
+            element_ref_2=_element_ref(tokens, 4),
+            range_ref_2=_range_ref(clause_2),
         )
         return text, None
 
-    range_one_match = _LINE_1_RANGE_ONE_RE.match(line_1)
-    if not range_one_match:
-        return None, "1 строка: IN +/- TF Element или RANGE +/- TF Element (UP/DOWN или +/- TF Element)"
-
-    sign_1, tf_1, element_1, direction = range_one_match.groups()
-    clause_data, clause_error = parse_range_clause(line_2)
-    if clause_error:
+    clause = _parse_range_clause(line_2)
+    if clause is None:
         return None, "2 строка для RANGE с 1 элементом: Actual/Prev +/- TF DR Premium/Equilibrium/Discount"
-    assert clause_data is not None
 
-    ath_or_atl = "ATH" if direction.upper() == "UP" else "ATL"
-    range_text = f"{clause_data[3]} {actual_prev_text(clause_data[0])} {dr_text(clause_data[1], clause_data[2])}"
-    text = (
-        f"Цена устанавливает {ath_or_atl}. "
-        f"Ближайшая опорная область - {element_text(sign_1, tf_1, element_1)}, расположенный в отметках {range_text}."
+    text = _RANGE_ONE_TEMPLATE.format(
+        extreme="ATH" if tokens[4].upper() == "UP" else "ATL",
+        element_ref=_element_ref(tokens, 1),
+        range_ref=_range_ref(clause),
     )
     return text, None
 
 
-class NotationTextEdit(QPlainTextEdit):
-    _ELEMENT_OPTIONS_NORMALIZED = {re.sub(r"\s+", " ", item).casefold() for item in ELEMENT_OPTIONS}
-    _TIMEFRAME_OPTIONS_NORMALIZED = {item.upper() for item in TIMEFRAME_OPTIONS}
+_SEPARATOR_PADDING = str.maketrans({"|": " | ", ";": " ; "})
+_LINE_HEAD_OPTIONS = ("IN", "RANGE")
+_ELEMENT_REF_OPTIONS = (("+", "-"), tuple(TIMEFRAME_OPTIONS), tuple(ELEMENT_OPTIONS))
+_RANGE_CLAUSE_OPTIONS = (("Actual", "Prev"), ("+", "-"), tuple(TIMEFRAME_OPTIONS), ("DR",), tuple(ZONE_OPTIONS))
+# (line number, line head, token index) -> completion suggestions; line 2 is keyed by the line 1 mode.
+_COMPLETION_TABLE: dict[tuple[int, str, int], tuple[str, ...]] = {
+    **{(0, "IN", index): options for index, options in enumerate(_ELEMENT_REF_OPTIONS, start=1)},
+    **{
+        (0, "RANGE", index): options
+        for index, options in enumerate((*_ELEMENT_REF_OPTIONS, ("UP", "DOWN", "+", "-"), *_ELEMENT_REF_OPTIONS[1:]), start=1)
+    },
+    **{(1, "", index): options for index, options in enumerate(_RANGE_CLAUSE_OPTIONS)},
+    **{(1, "RANGE2", index): options for index, options in enumerate((*_RANGE_CLAUSE_OPTIONS, ("|",), *_RANGE_CLAUSE_OPTIONS))},
+}
+
+
+@lru_cache(maxsize=64)
+def _mode_and_element_count(first_line: str) -> tuple[str | None, int]:
+    # Only the head token and the token count matter, so a complete line needs no separate check.
+    tokens = first_line.split()
+    if not tokens:
+        return None, 0
+    if tokens[0].upper() == "IN":
+        return "IN", 1
+    if tokens[0].upper() == "RANGE":
+        if len(tokens) >= 7:
+            return "RANGE", 2
+        return "RANGE", 1
+    return None, 0
+
+
+def _changed_span(old: str, new: str) -> tuple[int, int, int]:
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    return start, old_end, new_end
 
+
+def _utf16_length(text: str) -> int:
+    # QTextCursor positions count UTF-16 code units.
+    return len(text) if text.isascii() else len(text.encode("utf-16-le")) // 2
+
+
+@lru_cache(maxsize=16)
+def _generated_prefix_re(generated: str) -> re.Pattern[str]:
+    return re.compile(re.escape(generated), re.IGNORECASE)
+
+
+class NotationTextEdit(QPlainTextEdit):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._model = QStringListModel(self)
@@ -155,6 +264,12 @@ class NotationTextEdit(QPlainTextEdit):
         self._completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
         self._completer.setWidget(self)
         self._completer.activated.connect(self._insert_completion)
+        self._suggestions: tuple[str, ...] = ()
+        # Focus, clicks, completion inserts and line jumps can all request a popup in one event loop turn.
+        self._forced_completion_timer = QTimer(self)
+        self._forced_completion_timer.setSingleShot(True)
+        self._forced_completion_timer.setInterval(0)
+        self._forced_completion_timer.timeout.connect(self._show_forced_completions)
         self.setPlaceholderText(
             "1 строка: IN +/- TF Element или RANGE +/- TF Element (UP/DOWN или +/- TF Element)\n"
             "2 строка: Actual/Prev +/- TF DR Premium/Equilibrium/Discount"
@@ -182,24 +297,23 @@ class NotationTextEdit(QPlainTextEdit):
 
     def focusInEvent(self, event) -> None:  # type: ignore[override]
         super().focusInEvent(event)
-        QTimer.singleShot(0, lambda: self._show_completions(force=True))
+        self._forced_completion_timer.start()
 
     def mousePressEvent(self, event) -> None:  # type: ignore[override]
         super().mousePressEvent(event)
-        QTimer.singleShot(0, lambda: self._show_completions(force=True))
+        self._forced_completion_timer.start()
 
     def _insert_completion(self, completion: str) -> None:
         cursor = self.textCursor()
         line_text = cursor.block().text()
         position_in_block = cursor.positionInBlock()
 
-        start = position_in_block
-        while start > 0 and not line_text[start - 1].isspace():
-            start -= 1
-
-        end = position_in_block
-        while end < len(line_text) and not line_text[end].isspace():
-            end += 1
+        before = line_text[:position_in_block]
+        after = line_text[position_in_block:]
+        token_before = before.rsplit(None, 1)[-1] if before and not before[-1].isspace() else ""
+        token_after = after.split(None, 1)[0] if after and not after[0].isspace() else ""
+        start = position_in_block - len(token_before)
+        end = position_in_block + len(token_after)
 
         cursor.setPosition(cursor.position() - (position_in_block - start), QTextCursor.MoveMode.MoveAnchor)
         cursor.movePosition(
@@ -215,102 +329,61 @@ class NotationTextEdit(QPlainTextEdit):
         self._maybe_move_to_second_line()
         self._maybe_autofill_dr_token()
 
+    def _show_forced_completions(self) -> None:
+        self._show_completions(force=True)
+
     def _show_completions(self, force: bool) -> None:
         suggestions, prefix = self._completion_context()
         if not suggestions:
             self._completer.popup().hide()
             return
 
-        if prefix:
-            suggestions = [item for item in suggestions if item.casefold().startswith(prefix.casefold())]
-            if not suggestions:
-                self._completer.popup().hide()
-                return
-        elif not force:
+        if not prefix and not force:
             cursor = self.textCursor()
             if cursor.positionInBlock() > 0 and not cursor.block().text()[cursor.positionInBlock() - 1].isspace():
                 return
 
-        self._model.setStringList(suggestions)
+        # The completer filters by prefix itself; only reset the model when the option set changes.
+        if suggestions is not self._suggestions and suggestions != self._suggestions:
+            self._suggestions = suggestions
+            self._model.setStringList(list(suggestions))
         self._completer.setCompletionPrefix(prefix)
+        if prefix and self._completer.completionCount() == 0:
+            self._completer.popup().hide()
+            return
+
         popup = self._completer.popup()
         popup.setCurrentIndex(self._completer.completionModel().index(0, 0))
         rect = self.cursorRect()
         rect.setWidth(max(260, popup.sizeHintForColumn(0) + 24))
         self._completer.complete(rect)
 
-    def _completion_context(self) -> tuple[list[str], str]:
+    def _completion_context(self) -> tuple[tuple[str, ...], str]:
         cursor = self.textCursor()
         line_number = cursor.blockNumber()
         before = cursor.block().text()[: cursor.positionInBlock()]
-        token_source = re.sub(r"([|;])", r" \1 ", before)
+        token_source = before.translate(_SEPARATOR_PADDING)
+        tokens = token_source.split()
 
         if token_source and not token_source.endswith((" ", "\t")):
-            prefix = re.split(r"\s+", token_source)[-1]
-            token_index = len(re.split(r"\s+", token_source.strip())) - 1
+            prefix = tokens[-1] if tokens else ""
+            token_index = max(len(tokens) - 1, 0)
         else:
             prefix = ""
-            token_index = len(re.split(r"\s+", token_source.strip())) if token_source.strip() else 0
+            token_index = len(tokens)
 
         if line_number == 0:
-            first_line_tokens = re.split(r"\s+", before.strip()) if before.strip() else []
-            if token_index <= 0:
-                return ["IN", "RANGE"], prefix
-
+            first_line_tokens = before.split(maxsplit=1)
             head = first_line_tokens[0].upper() if first_line_tokens else ""
-            if head == "IN":
-                if token_index == 1:
-                    return ["+", "-"], prefix
-                if token_index == 2:
-                    return TIMEFRAME_OPTIONS, prefix
-                if token_index == 3:
-                    return ELEMENT_OPTIONS, prefix
-                return [], prefix
-
-            if head == "RANGE":
-                if token_index == 1:
-                    return ["+", "-"], prefix
-                if token_index == 2:
-                    return TIMEFRAME_OPTIONS, prefix
-                if token_index == 3:
-                    return ELEMENT_OPTIONS, prefix
-                if token_index == 4:
-                    return ["UP", "DOWN", "+", "-"], prefix
-                if token_index == 5:
-                    return TIMEFRAME_OPTIONS, prefix
-                if token_index == 6:
-                    return ELEMENT_OPTIONS, prefix
-                return [], prefix
-
-            return ["IN", "RANGE"], prefix
-
-        if line_number == 1:
+            if token_index <= 0 or head not in _LINE_HEAD_OPTIONS:
+                return _LINE_HEAD_OPTIONS, prefix
+        elif line_number == 1:
             mode, range_elements = self._current_mode_and_element_count()
-            if token_index <= 0:
-                return ["Actual", "Prev"], prefix
-            if token_index == 1:
-                return ["+", "-"], prefix
-            if token_index == 2:
-                return TIMEFRAME_OPTIONS, prefix
-            if token_index == 3:
-                return ["DR"], prefix
-            if token_index == 4:
-                return ZONE_OPTIONS, prefix
-            if mode == "RANGE" and range_elements == 2:
-                if token_index == 5:
-                    return ["|"], prefix
-                if token_index == 6:
-                    return ["Actual", "Prev"], prefix
-                if token_index == 7:
-                    return ["+", "-"], prefix
-                if token_index == 8:
-                    return TIMEFRAME_OPTIONS, prefix
-                if token_index == 9:
-                    return ["DR"], prefix
-                if token_index == 10:
-                    return ZONE_OPTIONS, prefix
-
-        return [], prefix
+            head = "RANGE2" if mode == "RANGE" and range_elements == 2 else ""
+        else:
+            return (), prefix
+
+        return _COMPLETION_TABLE.get((line_number, head, token_index), ()), prefix
 
     def _maybe_move_to_second_line(self) -> None:
         cursor = self.textCursor()
@@ -334,65 +407,23 @@ class NotationTextEdit(QPlainTextEdit):
         if second_block.isValid():
             cursor.setPosition(second_block.position())
             self.setTextCursor(cursor)
-            QTimer.singleShot(0, lambda: self._show_completions(force=True))
+            self._forced_completion_timer.start()
 
-    @classmethod
-    def _is_first_line_complete(cls, line_text: str) -> bool:
-        first_line = line_text.strip()
-        in_match = _LINE_1_IN_RE.match(first_line)
-        if in_match:
-            _sign, timeframe, element = in_match.groups()
-            return (
-                timeframe.upper() in cls._TIMEFRAME_OPTIONS_NORMALIZED
-                and element.casefold() in cls._ELEMENT_OPTIONS_NORMALIZED
-            )
-
-        range_one_match = _LINE_1_RANGE_ONE_RE.match(first_line)
-        if range_one_match:
-            sign_1, tf_1, element_1, _direction = range_one_match.groups()
-            first_ok = (
-                sign_1 in ("+", "-")
-                and tf_1.upper() in cls._TIMEFRAME_OPTIONS_NORMALIZED
-                and element_1.casefold() in cls._ELEMENT_OPTIONS_NORMALIZED
-            )
-            return first_ok
-
-        range_two_match = _LINE_1_RANGE_TWO_RE.match(first_line)
-        if range_two_match:
-            sign_1, tf_1, element_1, sign_2, tf_2, element_2 = range_two_match.groups()
-            first_ok = (
-                sign_1 in ("+", "-")
-                and tf_1.upper() in cls._TIMEFRAME_OPTIONS_NORMALIZED
-                and element_1.casefold() in cls._ELEMENT_OPTIONS_NORMALIZED
-            )
-            return (
-                first_ok
-                and sign_2 in ("+", "-")
-                and tf_2.upper() in cls._TIMEFRAME_OPTIONS_NORMALIZED
-                and element_2.casefold() in cls._ELEMENT_OPTIONS_NORMALIZED
-            )
-        return False
+    @staticmethod
+    def _is_first_line_complete(line_text: str) -> bool:
+        tokens = line_text.split()
+        parsed = _parse_line1(tokens)
+        if parsed is None:
+            return False
+        _mode, element_count = parsed
+        return all(
+            tokens[start + 1].upper() in _TIMEFRAME_TOKENS
+            and tokens[start + 2].casefold() in _ELEMENT_TOKENS
+            for start in (1, 4)[:element_count]
+        )
 
     def _current_mode_and_element_count(self) -> tuple[str | None, int]:
-        first_line = self.document().findBlockByNumber(0).text().strip()
-        if _LINE_1_IN_RE.match(first_line):
-            return "IN", 1
-
-        if _LINE_1_RANGE_ONE_RE.match(first_line):
-            return "RANGE", 1
-        if _LINE_1_RANGE_TWO_RE.match(first_line):
-            return "RANGE", 2
-
-        tokens = first_line.split()
-        if not tokens:
-            return None, 0
-        if tokens[0].upper() == "IN":
-            return "IN", 1
-        if tokens[0].upper() == "RANGE":
-            if len(tokens) >= 7:
-                return "RANGE", 2
-            return "RANGE", 1
-        return None, 0
+        return _mode_and_element_count(self.document().findBlockByNumber(0).text().strip())
 
     def _maybe_autofill_dr_token(self) -> None:
         cursor = self.textCursor()
@@ -404,34 +435,21 @@ class NotationTextEdit(QPlainTextEdit):
             return
 
         before = cursor.block().text()[: cursor.positionInBlock()]
-        token_source = re.sub(r"([|;])", r" \1 ", before)
+        token_source = before.translate(_SEPARATOR_PADDING)
         if not token_source.endswith((" ", "\t")):
             return
-        tokens = re.split(r"\s+", token_source.strip()) if token_source.strip() else []
-        if not tokens:
+        tokens = token_source.split()
+        if len(tokens) == 3:
+            should_insert = _is_range_prefix(tokens, 0)
+        elif len(tokens) == 9 and mode == "RANGE" and range_elements == 2:
+            should_insert = tokens[5] in ("|", ";") and _is_range_prefix(tokens, 6)
+        else:
             return
 
-        def is_range_prefix(start: int) -> bool:
-            if len(tokens) < start + 3:
-                return False
-            if tokens[start].upper() not in ("ACTUAL", "PREV"):
-                return False
-            if tokens[start + 1] not in ("+", "-"):
-                return False
-            if tokens[start + 2].upper() not in self._TIMEFRAME_OPTIONS_NORMALIZED:
-                return False
-            return True
-
-        should_insert = len(tokens) == 3 and is_range_prefix(0)
-        if mode == "RANGE" and range_elements == 2:
-            should_insert = should_insert or (
-                len(tokens) == 9 and len(tokens) > 5 and tokens[5] in ("|", ";") and is_range_prefix(6)
-            )
-
         if should_insert:
             cursor.insertText("DR ")
             self.setTextCursor(cursor)
-            QTimer.singleShot(0, lambda: self._show_completions(force=True))
+            self._forced_completion_timer.start()
 
 
 @dataclass(slots=True)
@@ -444,7 +462,7 @@ class SituationEntryData:
 
 class SituationEntryWidget(QFrame):
     changed = Signal()
-    remove_requested = Signal(QWidget)
+    remove_requested = Signal(QWidget, int)
 
     def __init__(self, data: SituationEntryData, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -453,7 +471,18 @@ class SituationEntryWidget(QFrame):
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
 
         self._base_dir: Path | None = None
+        self._index = 0
         self._source_pixmap = QPixmap()
+        self._scaled_preview_key: tuple[int, int] | None = None
+        self._scaled_preview_smooth = False
+        self._image_key: tuple[str, int] | None = None
+        self._pending_image_path = ""
+        image_loader().image_loaded.connect(self._on_image_loaded)
+        # While the window is being resized previews are scaled fast; the smooth pass runs once it settles.
+        self._smooth_preview_timer = QTimer(self)
+        self._smooth_preview_timer.setSingleShot(True)
+        self._smooth_preview_timer.setInterval(40)
+        self._smooth_preview_timer.timeout.connect(self._render_image_preview)
 
         root = QVBoxLayout(self)
         root.setContentsMargins(10, 10, 10, 10)
@@ -465,7 +494,7 @@ class SituationEntryWidget(QFrame):
         header.addWidget(self.title_label)
         header.addStretch(1)
         self.remove_button = QPushButton("Удалить")
-        self.remove_button.clicked.connect(lambda: self.remove_requested.emit(self))
+        self.remove_button.clicked.connect(lambda: self.remove_requested.emit(self, self._index - 1))
         header.addWidget(self.remove_button)
         root.addLayout(header)
 
@@ -503,6 +532,7 @@ class SituationEntryWidget(QFrame):
         self.timeframe_combo.currentIndexChanged.connect(lambda _: self.changed.emit())
 
     def set_index(self, index: int) -> None:
+        self._index = index
         self.title_label.setText(f"Картинка #{index}")
 
     def set_base_dir(self, base_dir: Path | None) -> None:
@@ -532,12 +562,7 @@ class SituationEntryWidget(QFrame):
         data = self.to_data()
         image_markdown_path = self._to_markdown_path(Path(data.image_path), base_dir)
         alt_text = Path(image_markdown_path).stem or f"situation_{index}"
-        return "\n".join(
-            [
-                f"![{alt_text}]({image_markdown_path})",
-                f"**TF:** {data.timeframe}",
-            ]
-        ).strip()
+        return f"![{alt_text}]({image_markdown_path})\n**TF:** {data.timeframe}".strip()
 
     def _resolve_image_path(self) -> Path:
         candidate = Path(self.image_path)
@@ -549,38 +574,74 @@ class SituationEntryWidget(QFrame):
 
     def _update_image_preview(self) -> None:
         resolved = self._resolve_image_path()
-        if not resolved.exists():
-            self._source_pixmap = QPixmap()
-            self.image_label.setText("Изображение не найдено")
-            self.image_label.setPixmap(QPixmap())
-            self.image_label.setMinimumSize(0, 0)
-            self.image_label.setMaximumSize(16777215, 16777215)
-            self.image_frame.setFixedHeight(120)
+        try:
+            image_key = (str(resolved), resolved.stat().st_mtime_ns)
+        except OSError:
+            self._pending_image_path = ""
+            self._show_image_message("Изображение не найдено")
+            return
+        # set_base_dir re-resolves every card; keep the preview when it still points at the same file.
+        if image_key == self._image_key and (self._pending_image_path or not self._source_pixmap.isNull()):
+            return
+
+        self._scaled_preview_key = None
+        self._pending_image_path = ""
+        self._image_key = image_key
+        loader = image_loader()
+        image = loader.cached_image(resolved)
+        if image is not None:
+            self._set_source_image(image)
             return
+        if not loader.request(resolved):
+            self._show_image_message("Не удалось загрузить изображение")
+            return
+        self._show_image_message("Загрузка изображения...")
+        self._pending_image_path = str(resolved)
+        self._image_key = image_key
+
+    def _on_image_loaded(self, path: str, image: QImage) -> None:
+        if not self._pending_image_path or path != self._pending_image_path:
+            return
+        self._pending_image_path = ""
+        self._set_source_image(image)
 
-        source = QPixmap(str(resolved))
+    def _set_source_image(self, image: QImage) -> None:
+        source = QPixmap.fromImage(image)
         if source.isNull():
-            self._source_pixmap = QPixmap()
-            self.image_label.setText("Не удалось загрузить изображение")
-            self.image_label.setPixmap(QPixmap())
-            self.image_label.setMinimumSize(0, 0)
-            self.image_label.setMaximumSize(16777215, 16777215)
-            self.image_frame.setFixedHeight(120)
+            self._show_image_message("Не удалось загрузить изображение")
             return
 
         self._source_pixmap = source
         self._render_image_preview()
 
-    def _render_image_preview(self) -> None:
+    def _show_image_message(self, text: str) -> None:
+        self._image_key = None
+        self._source_pixmap = QPixmap()
+        self.image_label.setPixmap(QPixmap())
+        self.image_label.setText(text)
+        self.image_label.setMinimumSize(0, 0)
+        self.image_label.setMaximumSize(16777215, 16777215)
+        self.image_frame.setFixedHeight(120)
+
+    def _render_image_preview(self, smooth: bool = True) -> None:
         if self._source_pixmap.isNull():
             return
 
         frame_width = self.image_frame.width() if self.image_frame.width() > 16 else self.width()
         target_width = max(320, int((frame_width - 2) * 1.24))
         target_width = min(target_width, max(120, frame_width - 2))
-        scaled = self._source_pixmap.scaledToWidth(target_width, Qt.TransformationMode.SmoothTransformation)
+        # Resize events arrive in bursts; the label already shows this exact scaling.
+        preview_key = (target_width, self._source_pixmap.cacheKey())
+        if preview_key == self._scaled_preview_key and (self._scaled_preview_smooth or not smooth):
+            return
+        self._scaled_preview_key = preview_key
+        self._scaled_preview_smooth = smooth
+        transformation = (
+            Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
+        )
+        scaled = self._source_pixmap.scaledToWidth(target_width, transformation)
         if scaled.height() > 544:
-            scaled = scaled.scaledToHeight(544, Qt.TransformationMode.SmoothTransformation)
+            scaled = scaled.scaledToHeight(544, transformation)
         self.image_label.setText("")
         self.image_label.setMinimumSize(scaled.size())
         self.image_label.setMaximumSize(scaled.size())
@@ -591,7 +652,8 @@ class SituationEntryWidget(QFrame):
 
     def resizeEvent(self, event) -> None:  # type: ignore[override]
         super().resizeEvent(event)
-        self._render_image_preview()
+        self._render_image_preview(smooth=False)
+        self._smooth_preview_timer.start()
 
     @staticmethod
     def _to_markdown_path(path: Path, base_dir: Path | None) -> str:
@@ -611,7 +673,12 @@ class CurrentSituationEditor(QWidget):
         self._base_dir: Path | None = None
         self._read_mode = False
         self._auto_generated_text = ""
+        # Stripped notation text, refreshed whenever a pending notation update is applied.
+        self._notation_text = ""
         self._entries: list[SituationEntryWidget] = []
+        self._markdown_cache_key: tuple | None = None
+        self._markdown_cache_value = ""
+        self._empty_state_key: tuple[bool, bool] | None = None
 
         root = QVBoxLayout(self)
         root.setContentsMargins(0, 0, 0, 0)
@@ -633,12 +700,12 @@ class CurrentSituationEditor(QWidget):
         root.addWidget(self.empty_label)
 
         self.entries_container = QWidget()
-        self.entries_layout = QGridLayout(self.entries_container)
+        # Two cards per row; each row is its own layout so a change only re-lays out the rows it touches.
+        self.entries_layout = QVBoxLayout(self.entries_container)
         self.entries_layout.setContentsMargins(0, 0, 0, 0)
         self.entries_layout.setSpacing(10)
         self.entries_layout.setSizeConstraint(QLayout.SizeConstraint.SetMinimumSize)
-        self.entries_layout.setColumnStretch(0, 1)
-        self.entries_layout.setColumnStretch(1, 1)
+        self._row_layouts: list[QHBoxLayout] = []
         self.entries_container.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
         root.addWidget(self.entries_container)
 
@@ -668,8 +735,23 @@ class CurrentSituationEditor(QWidget):
 
         root.addWidget(self.notation_container)
 
+        self._notation_update_timer = QTimer(self)
+        self._notation_update_timer.setSingleShot(True)
+        self._notation_update_timer.setInterval(100)
+        self._notation_update_timer.timeout.connect(self._apply_notation_update)
+        # Mutations made within one event-loop turn are reported with a single content_changed.
+        self._content_changed_timer = QTimer(self)
+        self._content_changed_timer.setSingleShot(True)
+        self._content_changed_timer.setInterval(0)
+        self._content_changed_timer.timeout.connect(self.content_changed)
+        # Typing in the manual text is reported once the keystrokes pause.
+        self._manual_changed_timer = QTimer(self)
+        self._manual_changed_timer.setSingleShot(True)
+        self._manual_changed_timer.setInterval(80)
+        self._manual_changed_timer.timeout.connect(self.content_changed)
+
         self.notation_edit.textChanged.connect(self._on_notation_changed)
-        self.manual_edit.textChanged.connect(self.content_changed)
+        self.manual_edit.textChanged.connect(self._manual_changed_timer.start)
 
         self._update_empty_state()
         self._update_notation_feedback()
@@ -678,9 +760,6 @@ class CurrentSituationEditor(QWidget):
         self._read_mode = read_mode
         self.add_image_button.setVisible(not read_mode)
         self.paste_image_button.setVisible(not read_mode)
-        self.notation_label.setVisible(not read_mode)
-        self.notation_edit.setVisible(not read_mode)
-        self.notation_status.setVisible(not read_mode)
         self.manual_label.setVisible(not read_mode)
         self.manual_label.setText("Текст под картинками")
         self.manual_edit.setReadOnly(read_mode)
@@ -694,6 +773,9 @@ class CurrentSituationEditor(QWidget):
             entry.set_base_dir(base_dir)
 
     def load_from_markdown(self, markdown: str) -> None:
+        self._notation_update_timer.stop()
+        self._content_changed_timer.stop()
+        self._manual_changed_timer.stop()
         parsed_entries, notation_text, manual_text = self._parse_block(markdown)
         generated_from_notation = self._generated_text_from_notation(notation_text)
         manual_suffix = self._extract_manual_suffix(manual_text, generated_from_notation)
@@ -705,6 +787,7 @@ class CurrentSituationEditor(QWidget):
         self.notation_edit.blockSignals(True)
         self.notation_edit.setPlainText(notation_text)
         self.notation_edit.blockSignals(False)
+        self._notation_text = notation_text
         self.manual_edit.blockSignals(True)
         self.manual_edit.setPlainText(composed_manual_text)
         self.manual_edit.blockSignals(False)
@@ -715,9 +798,20 @@ class CurrentSituationEditor(QWidget):
         self.content_changed.emit()
 
     def to_markdown(self) -> str:
-        chunks = [entry.to_markdown(index + 1, self._base_dir) for index, entry in enumerate(self._entries)]
-        notation = self.notation_edit.toPlainText().strip()
+        self.flush_pending_changes()
+        notation = self._notation_text
         manual_text = self.manual_edit.toPlainText().strip()
+        # The section status bar re-serializes every editor on each change; most calls see identical inputs.
+        cache_key = (
+            tuple((entry.image_path, entry.timeframe_combo.currentData()) for entry in self._entries),
+            notation,
+            manual_text,
+            self._base_dir,
+        )
+        if cache_key == self._markdown_cache_key:
+            return self._markdown_cache_value
+
+        chunks = [entry.to_markdown(index + 1, self._base_dir) for index, entry in enumerate(self._entries)]
         generated_from_notation = self._generated_text_from_notation(notation)
         manual_suffix = self._extract_manual_suffix(manual_text, generated_from_notation)
         manual_text = self._compose_manual_text(generated_from_notation, manual_suffix)
@@ -729,9 +823,13 @@ class CurrentSituationEditor(QWidget):
             parts.append(f"<!-- NOTATION\n{notation}\n-->")
         if manual_text:
             parts.append(manual_text)
-        return "\n\n".join(part for part in parts if part.strip()).strip()
+        markdown = "\n\n".join(part for part in parts if part.strip()).strip()
+        self._markdown_cache_key = cache_key
+        self._markdown_cache_value = markdown
+        return markdown
 
     def validate_content(self) -> tuple[bool, str]:
+        self.flush_pending_changes()
         if not self._entries:
             return False, "В разделе текущей ситуации нужна минимум одна картинка."
 
@@ -741,7 +839,7 @@ class CurrentSituationEditor(QWidget):
                 continue
             return False, f"Картинка #{index}: {error}"
 
-        notation = self.notation_edit.toPlainText().strip()
+        notation = self._notation_text
         if not notation:
             return False, "Заполните нотацию для блока текущей ситуации."
 
@@ -751,6 +849,15 @@ class CurrentSituationEditor(QWidget):
 
         return True, ""
 
+    def flush_pending_changes(self) -> None:
+        if self._notation_update_timer.isActive():
+            self._notation_update_timer.stop()
+            self._apply_notation_update()
+        if self._content_changed_timer.isActive() or self._manual_changed_timer.isActive():
+            self._content_changed_timer.stop()
+            self._manual_changed_timer.stop()
+            self.content_changed.emit()
+
     def has_content(self) -> bool:
         return bool(self._entries)
 
@@ -758,12 +865,20 @@ class CurrentSituationEditor(QWidget):
         return list(self._entries)
 
     def _on_notation_changed(self) -> None:
+        self._notation_update_timer.start()
+
+    def _apply_notation_update(self) -> None:
+        notation = self.notation_edit.toPlainText().strip()
+        # Whitespace-only edits (e.g. a trailing newline) change nothing that is derived from the notation.
+        if notation == self._notation_text:
+            return
+        self._notation_text = notation
         self._sync_manual_text_with_notation()
         self._update_notation_feedback()
-        self.content_changed.emit()
+        self._content_changed_timer.start()
 
     def _update_notation_feedback(self) -> None:
-        notation = self.notation_edit.toPlainText().strip()
+        notation = self._notation_text
         if not notation:
             self.notation_status.setStyleSheet("color: #95a1b5;")
             self.notation_status.setText("Подсказка: нотация должна содержать ровно 2 непустые строки.")
@@ -790,9 +905,9 @@ class CurrentSituationEditor(QWidget):
             return
 
         self._add_entry_widget(SituationEntryData(image_path=image_file))
-        self._update_entry_titles()
+        self._update_entry_titles(len(self._entries) - 1)
         self._update_empty_state()
-        self.content_changed.emit()
+        self._content_changed_timer.start()
 
     def _on_paste_image_clicked(self) -> None:
         image_path = image_path_from_clipboard()
@@ -801,9 +916,9 @@ class CurrentSituationEditor(QWidget):
             return
 
         self._add_entry_widget(SituationEntryData(image_path=str(image_path)))
-        self._update_entry_titles()
+        self._update_entry_titles(len(self._entries) - 1)
         self._update_empty_state()
-        self.content_changed.emit()
+        self._content_changed_timer.start()
 
     def _add_entry_widget(self, data: SituationEntryData) -> None:
         entry = SituationEntryWidget(data, self)
@@ -814,44 +929,97 @@ class CurrentSituationEditor(QWidget):
         self._entries.append(entry)
         self._refresh_entries_layout()
 
-    def _remove_entry_widget(self, widget: QWidget) -> None:
-        if widget in self._entries:
-            self._entries.remove(widget)
+    def _remove_entry_widget(self, widget: QWidget, position: int) -> None:
+        if not (0 <= position < len(self._entries) and self._entries[position] is widget):
+            return
+        del self._entries[position]
         widget.setParent(None)
         widget.deleteLater()
         self._refresh_entries_layout()
-        self._update_entry_titles()
+        self._update_entry_titles(position)
         self._update_empty_state()
-        self.content_changed.emit()
+        self._content_changed_timer.start()
 
     def _clear_entries(self) -> None:
-        while self._entries:
-            widget = self._entries.pop()
+        if not self._entries:
+            return
+        # Drop the row layouts in one pass before detaching the cards so nothing is re-laid out per removal.
+        self.entries_container.setUpdatesEnabled(False)
+        while self._row_layouts:
+            self._remove_row_layout()
+        for widget in self._entries:
             widget.setParent(None)
             widget.deleteLater()
-        self._refresh_entries_layout()
+        self._entries.clear()
+        self.entries_container.setUpdatesEnabled(True)
 
-    def _update_entry_titles(self) -> None:
-        for index, entry in enumerate(self._entries, start=1):
-            entry.set_index(index)
+    def _update_entry_titles(self, start: int = 0) -> None:
+        for index in range(start, len(self._entries)):
+            self._entries[index].set_index(index + 1)
 
     def _refresh_entries_layout(self) -> None:
-        while self.entries_layout.count():
-            self.entries_layout.takeAt(0)
+        row_count = (len(self._entries) + 1) // 2
+        stale_rows: list[int] = []
+        for row in range(row_count):
+            wanted = self._entries[row * 2 : row * 2 + 2]
+            if row >= len(self._row_layouts) or self._row_widgets(self._row_layouts[row]) != wanted:
+                stale_rows.append(row)
+        if not stale_rows and len(self._row_layouts) == row_count:
+            return
 
-        for index, entry in enumerate(self._entries):
-            row = index // 2
-            col = index % 2
-            self.entries_layout.addWidget(entry, row, col)
+        # Only rows after an insert/removal point change; leave the rest in place.
+        self.entries_container.setUpdatesEnabled(False)
+        while len(self._row_layouts) > row_count:
+            self._remove_row_layout()
+        for row in stale_rows:
+            if row < len(self._row_layouts):
+                row_layout = self._row_layouts[row]
+                while row_layout.count():
+                    row_layout.takeAt(0)
+        for row in stale_rows:
+            if row == len(self._row_layouts):
+                row_layout = QHBoxLayout()
+                row_layout.setSpacing(10)
+                self.entries_layout.addLayout(row_layout)
+                self._row_layouts.append(row_layout)
+            row_layout = self._row_layouts[row]
+            wanted = self._entries[row * 2 : row * 2 + 2]
+            for entry in wanted:
+                row_layout.addWidget(entry, 1)
+            if len(wanted) == 1:
+                # Keep a lone card at half width, as in a full row.
+                row_layout.addSpacing(row_layout.spacing())
+                row_layout.addStretch(1)
+        self.entries_container.setUpdatesEnabled(True)
+
+    def _remove_row_layout(self) -> None:
+        row_layout = self._row_layouts.pop()
+        while row_layout.count():
+            row_layout.takeAt(0)
+        self.entries_layout.removeItem(row_layout)
+        row_layout.deleteLater()
+
+    @staticmethod
+    def _row_widgets(row_layout: QHBoxLayout) -> list[QWidget]:
+        items = (row_layout.itemAt(index) for index in range(row_layout.count()))
+        return [item.widget() for item in items if item.widget() is not None]
 
     def _update_empty_state(self) -> None:
         is_empty = len(self._entries) == 0
+        state_key = (is_empty, self._read_mode)
+        if state_key == self._empty_state_key:
+            return
+        self._empty_state_key = state_key
+
+        show_notation = (not is_empty) and (not self._read_mode)
+        self.setUpdatesEnabled(False)
         self.empty_label.setVisible(is_empty)
         self.entries_container.setVisible(not is_empty)
         self.notation_container.setVisible(not is_empty)
-        self.notation_label.setVisible((not is_empty) and (not self._read_mode))
-        self.notation_edit.setVisible((not is_empty) and (not self._read_mode))
-        self.notation_status.setVisible((not is_empty) and (not self._read_mode))
+        self.notation_label.setVisible(show_notation)
+        self.notation_edit.setVisible(show_notation)
+        self.notation_status.setVisible(show_notation)
+        self.setUpdatesEnabled(True)
 
     @staticmethod
     def _extract_manual_suffix(manual_text: str, generated_text: str) -> str:
@@ -859,8 +1027,12 @@ class CurrentSituationEditor(QWidget):
         generated = generated_text.strip()
         if not generated:
             return text
-        if text.casefold().startswith(generated.casefold()):
+        # The generated text is written by the editor itself, so an exact prefix is the common case.
+        if text.startswith(generated):
             return text[len(generated) :].lstrip(" \t\r\n-:;,.")
+        match = _generated_prefix_re(generated).match(text)
+        if match is not None:
+            return text[match.end() :].lstrip(" \t\r\n-:;,.")
         return text
 
     @staticmethod
@@ -885,7 +1057,7 @@ class CurrentSituationEditor(QWidget):
 
     def _sync_manual_text_with_notation(self) -> None:
         current_manual = self.manual_edit.toPlainText().strip()
-        notation_text = self.notation_edit.toPlainText().strip()
+        notation_text = self._notation_text
         generated = self._generated_text_from_notation(notation_text)
         if notation_text and not generated:
             return
@@ -899,34 +1071,29 @@ class CurrentSituationEditor(QWidget):
         if composed == current_manual:
             return
 
+        # Rewrite only the span that differs so the undo history and the user's cursor survive.
+        document_text = self.manual_edit.toPlainText()
+        start, old_end, new_end = _changed_span(document_text, composed)
+        cursor_at_end = self.manual_edit.textCursor().atEnd()
         self.manual_edit.blockSignals(True)
-        self.manual_edit.setPlainText(composed)
-        cursor = self.manual_edit.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.manual_edit.setTextCursor(cursor)
+        cursor = QTextCursor(self.manual_edit.document())
+        cursor.setPosition(_utf16_length(document_text[:start]))
+        cursor.setPosition(_utf16_length(document_text[:old_end]), QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(composed[start:new_end])
+        if cursor_at_end:
+            self.manual_edit.moveCursor(QTextCursor.MoveOperation.End)
         self.manual_edit.blockSignals(False)
 
     @staticmethod
-    def _parse_entries(markdown: str) -> list[SituationEntryData]:
-        text = markdown.strip()
-        if not text:
-            return []
-
-        image_matches = list(_IMAGE_RE.finditer(text))
-        if not image_matches:
-            return []
-
+    def _parse_entries(text: str, image_matches: list[re.Match[str]]) -> list[SituationEntryData]:
         entries: list[SituationEntryData] = []
-        for index, match in enumerate(image_matches):
-            start = match.start()
-            end = image_matches[index + 1].start() if index + 1 < len(image_matches) else len(text)
+        bounds = [match.start() for match in image_matches]
+        bounds.append(len(text))
+        for match, (start, end) in zip(image_matches, pairwise(bounds)):
             chunk = text[start:end].strip()
 
             image_path = match.group(1).strip()
-            timeframe_match = re.search(r"(?mi)^\*\*TF:\*\*\s*(.+?)\s*$", chunk)
-            if not timeframe_match:
-                timeframe_match = re.search(r"(?mi)^TF:\s*(.+?)\s*$", chunk)
-            timeframe = timeframe_match.group(1).strip() if timeframe_match else ""
+            timeframe = _find_timeframe(chunk)
 
             entries.append(
                 SituationEntryData(
@@ -942,20 +1109,29 @@ class CurrentSituationEditor(QWidget):
         text = markdown.strip()
         if not text:
             return [], "", ""
-
-        entries = cls._parse_entries(text)
-
-        notation = ""
-        notation_match = _NOTATION_COMMENT_RE.search(text)
-        if notation_match:
-            notation = notation_match.group(1).strip()
-
-        manual_text = _NOTATION_COMMENT_RE.sub("", text)
-        manual_text = _IMAGE_RE.sub("", manual_text)
-        manual_text = re.sub(r"(?mi)^(?:\*\*TF:\*\*|TF:)\s*.+$", "", manual_text)
-        manual_text = re.sub(r"(?mi)^---+\s*$", "", manual_text)
+        # Images and the notation comment both need these markers; plain notes skip the token scan.
+        if "![" not in text and "<!--" not in text:
+            return [], "", _MANUAL_NOISE_RE.sub("", text).strip()
+
+        image_matches: list[re.Match[str]] = []
+        notation: str | None = None
+        manual_parts: list[str] = []
+        position = 0
+        for match in _BLOCK_TOKEN_RE.finditer(text):
+            manual_parts.append(text[position : match.start()])
+            position = match.end()
+            if match.group(1) is not None:
+                image_matches.append(match)
+            elif notation is None:
+                notation = match.group(2).strip()
+        manual_parts.append(text[position:])
+
+        entries = cls._parse_entries(text, image_matches)
+
+        manual_text = "".join(manual_parts)
+        manual_text = _MANUAL_NOISE_RE.sub("", manual_text)
         manual_text = manual_text.strip()
 
-        return entries, notation, manual_text
+        return entries, notation or "", manual_text
 
 
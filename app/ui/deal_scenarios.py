@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 import re
 
 from PySide6.QtCore import QTimer, Qt, Signal
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QImage, QPixmap, QPixmapCache
 from PySide6.QtWidgets import (
     QComboBox,
     QFileDialog,
@@ -25,8 +26,10 @@ from PySide6.QtWidgets import (
 
 from .current_situation import TIMEFRAME_OPTIONS
 from .image_clipboard import image_path_from_clipboard
+from .image_loader import image_loader
 
-_IMAGE_RE = re.compile(r"!\[[^\]]*]\(([^)]+)\)")
+# Image links never span lines; bounded possessive runs keep a stray "![" from rescanning the rest of the text.
+_IMAGE_RE = re.compile(r"!\[[^\]\n]{0,512}+]\(([^)\n]{1,2048}+)\)")
 _TRANSITION_REF_RE = re.compile(r"(?mi)^\*\*Сценарий перехода:\*\*\s*(.+?)\s*$")
 _FIELD_DEFINITIONS: list[tuple[str, str]] = [
     ("idea", "Идея сделки"),
@@ -34,21 +37,37 @@ _FIELD_DEFINITIONS: list[tuple[str, str]] = [
     ("sl", "SL: Почему именно так? Что он отменяет? Обосновать"),
     ("tp", "TP: Почему именно так? Это оптимальная цель? Обосновать"),
 ]
+# One named group per field, so a single scan finds every header in document order.
+_FIELD_HEADERS_RE = re.compile(
+    "(?mi)" + "|".join(rf"(?P<{key}>^\*\*{re.escape(header)}\*\*\s*$)" for key, header in _FIELD_DEFINITIONS)
+)
+_DEAL_HEADING_RE = re.compile(r"(?mi)^####\s+.+$")
+_DEAL_SEPARATOR_SPLIT_RE = re.compile(r"(?mi)^\s*---+\s*$")
+_TIMEFRAME_RE = re.compile(r"(?mi)^\s*(?:\*\*TF:\*\*|TF:)\s*(.+?)\s*$")
+# Lines dropped from a deal without field headers before the rest becomes its idea.
+_TIMEFRAME_LINE_RE = re.compile(r"(?mi)^\s*(?:\*\*TF:\*\*|TF:)\s*.+$")
+_TRANSITION_LINE_RE = re.compile(r"(?mi)^\*\*Сценарий перехода:\*\*.*$")
+_SEPARATOR_LINE_RE = re.compile(r"(?mi)^---+\s*$")
 
 
 def _extract_fields_by_headers(chunk: str) -> dict[str, str]:
+    # Every field header is bold, so a chunk without "**" has none of them.
+    if "**" not in chunk:
+        return {key: "" for key, _ in _FIELD_DEFINITIONS}
+
     matches: list[tuple[int, int, str]] = []
-    for key, header in _FIELD_DEFINITIONS:
-        pattern = re.compile(rf"(?mi)^\*\*{re.escape(header)}\*\*\s*$")
-        match = pattern.search(chunk)
-        if not match:
+    seen: set[str] = set()
+    for match in _FIELD_HEADERS_RE.finditer(chunk):
+        key = match.lastgroup
+        # Only the first header of each field counts; a repeated one stays in the preceding body.
+        if key in seen:
             continue
+        seen.add(key)
         matches.append((match.start(), match.end(), key))
 
     if not matches:
         return {key: "" for key, _ in _FIELD_DEFINITIONS}
 
-    matches.sort(key=lambda item: item[0])
     values: dict[str, str] = {key: "" for key, _ in _FIELD_DEFINITIONS}
     for index, (_start, body_start, key) in enumerate(matches):
         body_end = matches[index + 1][0] if index + 1 < len(matches) else len(chunk)
@@ -56,6 +75,19 @@ def _extract_fields_by_headers(chunk: str) -> dict[str, str]:
     return values
 
 
+# Deal markdown is rebuilt on every edit while image paths rarely change.
+@lru_cache(maxsize=256)
+def _markdown_image_target(image_path: str, base_dir: Path | None) -> tuple[str, str]:
+    path = Path(image_path)
+    markdown_path = path.as_posix()
+    if path.is_absolute() and base_dir:
+        try:
+            markdown_path = path.relative_to(base_dir).as_posix()
+        except ValueError:
+            pass
+    return markdown_path, Path(markdown_path).stem
+
+
 class AutoHeightPlainTextEdit(QPlainTextEdit):
     def __init__(self, min_height: int = 110, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -63,13 +95,21 @@ class AutoHeightPlainTextEdit(QPlainTextEdit):
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.textChanged.connect(self._update_height)
+        # textChanged and documentSizeChanged both fire per keystroke; measure once per event-loop turn.
+        self._height_timer = QTimer(self)
+        self._height_timer.setSingleShot(True)
+        self._height_timer.setInterval(0)
+        self._height_timer.timeout.connect(self._update_height)
+        self.textChanged.connect(self._schedule_height_update)
         document_layout = self.document().documentLayout()
         if document_layout is not None:
-            document_layout.documentSizeChanged.connect(self._update_height)
-        QTimer.singleShot(0, self._update_height)
+            document_layout.documentSizeChanged.connect(self._schedule_height_update)
+        self._height_timer.start()
 
-    def _update_height(self, *_args) -> None:
+    def _schedule_height_update(self, *_args) -> None:
+        self._height_timer.start()
+
+    def _update_height(self) -> None:
         document_layout = self.document().documentLayout()
         if document_layout is None:
             return
@@ -101,7 +141,7 @@ class DealScenarioData:
 
 class DealScenarioImageWidget(QFrame):
     changed = Signal()
-    remove_requested = Signal(QWidget)
+    remove_requested = Signal(QWidget, int)
 
     def __init__(self, data: DealScenarioImageData, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -109,8 +149,19 @@ class DealScenarioImageWidget(QFrame):
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
 
         self._base_dir: Path | None = None
+        self._index = 0
         self._source_pixmap = QPixmap()
+        self._scaled_preview_key: tuple[int, int] | None = None
+        self._scaled_preview_smooth = False
+        self._image_key: tuple[str, int] | None = None
+        self._pending_image_path = ""
+        image_loader().image_loaded.connect(self._on_image_loaded)
         self.image_path = data.image_path
+        # While the window is being resized previews are scaled fast; the smooth pass runs once it settles.
+        self._smooth_preview_timer = QTimer(self)
+        self._smooth_preview_timer.setSingleShot(True)
+        self._smooth_preview_timer.setInterval(40)
+        self._smooth_preview_timer.timeout.connect(self._render_image_preview)
 
         root = QVBoxLayout(self)
         root.setContentsMargins(8, 8, 8, 8)
@@ -122,7 +173,7 @@ class DealScenarioImageWidget(QFrame):
         header.addWidget(self.title_label)
         header.addStretch(1)
         self.remove_button = QPushButton("Удалить")
-        self.remove_button.clicked.connect(lambda: self.remove_requested.emit(self))
+        self.remove_button.clicked.connect(lambda: self.remove_requested.emit(self, self._index - 1))
         header.addWidget(self.remove_button)
         root.addLayout(header)
 
@@ -143,6 +194,7 @@ class DealScenarioImageWidget(QFrame):
         self._update_image_preview()
 
     def set_index(self, index: int) -> None:
+        self._index = index
         self.title_label.setText(f"Картинка #{index}")
 
     def set_base_dir(self, base_dir: Path | None) -> None:
@@ -170,38 +222,79 @@ class DealScenarioImageWidget(QFrame):
 
     def _update_image_preview(self) -> None:
         resolved = self._resolve_image_path()
-        if not resolved.exists():
-            self._source_pixmap = QPixmap()
-            self.image_label.setText("Изображение не найдено")
-            self.image_label.setPixmap(QPixmap())
-            self.image_label.setMinimumSize(0, 0)
-            self.image_label.setMaximumSize(16777215, 16777215)
-            self.image_frame.setFixedHeight(120)
+        try:
+            image_key = (str(resolved), resolved.stat().st_mtime_ns)
+        except OSError:
+            self._pending_image_path = ""
+            self._show_image_message("Изображение не найдено")
+            return
+        # Every save re-syncs plan images through here; keep the preview when it still points at the same file.
+        if image_key == self._image_key and (self._pending_image_path or not self._source_pixmap.isNull()):
+            return
+
+        self._scaled_preview_key = None
+        self._pending_image_path = ""
+        self._image_key = image_key
+        loader = image_loader()
+        image = loader.cached_image(resolved)
+        if image is not None:
+            self._set_source_image(image)
             return
+        if not loader.request(resolved):
+            self._show_image_message("Не удалось загрузить изображение")
+            return
+        self._show_image_message("Загрузка изображения...")
+        self._pending_image_path = str(resolved)
+        self._image_key = image_key
 
-        source = QPixmap(str(resolved))
-        if source.isNull():
-            self._source_pixmap = QPixmap()
-            self.image_label.setText("Не удалось загрузить изображение")
-            self.image_label.setPixmap(QPixmap())
-            self.image_label.setMinimumSize(0, 0)
-            self.image_label.setMaximumSize(16777215, 16777215)
-            self.image_frame.setFixedHeight(120)
+    def _on_image_loaded(self, path: str, image: QImage) -> None:
+        if not self._pending_image_path or path != self._pending_image_path:
             return
+        self._pending_image_path = ""
+        self._set_source_image(image)
+
+    def _set_source_image(self, image: QImage) -> None:
+        # Cards showing the same file get the same cached QImage, so they can share one converted pixmap too.
+        cache_key = f"deal-image:{image.cacheKey()}"
+        source = QPixmapCache.find(cache_key)
+        if source is None:
+            source = QPixmap.fromImage(image)
+            if source.isNull():
+                self._show_image_message("Не удалось загрузить изображение")
+                return
+            QPixmapCache.insert(cache_key, source)
 
         self._source_pixmap = source
         self._render_image_preview()
 
-    def _render_image_preview(self) -> None:
+    def _show_image_message(self, text: str) -> None:
+        self._image_key = None
+        self._source_pixmap = QPixmap()
+        self.image_label.setPixmap(QPixmap())
+        self.image_label.setText(text)
+        self.image_label.setMinimumSize(0, 0)
+        self.image_label.setMaximumSize(16777215, 16777215)
+        self.image_frame.setFixedHeight(120)
+
+    def _render_image_preview(self, smooth: bool = True) -> None:
         if self._source_pixmap.isNull():
             return
 
         frame_width = self.image_frame.width() if self.image_frame.width() > 16 else self.width()
         target_width = max(320, int((frame_width - 2) * 1.24))
         target_width = min(target_width, max(120, frame_width - 2))
-        scaled = self._source_pixmap.scaledToWidth(target_width, Qt.TransformationMode.SmoothTransformation)
+        # Resize events arrive in bursts; the label already shows this exact scaling.
+        preview_key = (target_width, self._source_pixmap.cacheKey())
+        if preview_key == self._scaled_preview_key and (self._scaled_preview_smooth or not smooth):
+            return
+        self._scaled_preview_key = preview_key
+        self._scaled_preview_smooth = smooth
+        transformation = (
+            Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
+        )
+        scaled = self._source_pixmap.scaledToWidth(target_width, transformation)
         if scaled.height() > 544:
-            scaled = scaled.scaledToHeight(544, Qt.TransformationMode.SmoothTransformation)
+            scaled = scaled.scaledToHeight(544, transformation)
         self.image_label.setText("")
         self.image_label.setMinimumSize(scaled.size())
         self.image_label.setMaximumSize(scaled.size())
@@ -212,12 +305,13 @@ class DealScenarioImageWidget(QFrame):
 
     def resizeEvent(self, event) -> None:  # type: ignore[override]
         super().resizeEvent(event)
-        self._render_image_preview()
+        self._render_image_preview(smooth=False)
+        self._smooth_preview_timer.start()
 
 
 class DealScenarioWidget(QFrame):
     changed = Signal()
-    remove_requested = Signal(QWidget)
+    remove_requested = Signal(QWidget, int)
 
     def __init__(self, data: DealScenarioData, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -226,6 +320,7 @@ class DealScenarioWidget(QFrame):
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
 
         self._base_dir: Path | None = None
+        self._index = 0
         self._transition_ref = data.transition_ref.strip()
         self._read_mode = False
         self._images: list[DealScenarioImageWidget] = []
@@ -255,7 +350,7 @@ class DealScenarioWidget(QFrame):
         self.paste_image_button.clicked.connect(self._on_paste_image_clicked)
         header.addWidget(self.paste_image_button)
         self.remove_button = QPushButton("\u0423\u0434\u0430\u043b\u0438\u0442\u044c")
-        self.remove_button.clicked.connect(lambda: self.remove_requested.emit(self))
+        self.remove_button.clicked.connect(lambda: self.remove_requested.emit(self, self._index - 1))
         header.addWidget(self.remove_button)
         root.addLayout(header)
 
@@ -336,6 +431,7 @@ class DealScenarioWidget(QFrame):
         self.collapse_button.setArrowType(Qt.ArrowType.DownArrow if expanded else Qt.ArrowType.RightArrow)
 
     def set_index(self, index: int) -> None:
+        self._index = index
         self.title_label.setText(f"Сделка #{index}")
 
     def set_base_dir(self, base_dir: Path | None) -> None:
@@ -362,11 +458,13 @@ class DealScenarioWidget(QFrame):
         self.transition_combo.blockSignals(True)
         self.transition_combo.clear()
         self.transition_combo.addItem("Выберите сценарий перехода", "")
-        for reference, label in choices:
+        index_by_ref: dict[str, int] = {}
+        for index, (reference, label) in enumerate(choices, start=1):
             self.transition_combo.addItem(label, reference)
+            index_by_ref.setdefault(reference, index)
 
         if previous_ref:
-            index = self.transition_combo.findData(previous_ref)
+            index = index_by_ref.get(previous_ref, -1)
             if index < 0:
                 self.transition_combo.addItem(f"(Не найдено) {previous_ref}", previous_ref)
                 index = self.transition_combo.count() - 1
@@ -414,30 +512,23 @@ class DealScenarioWidget(QFrame):
 
     def to_markdown(self, index: int, base_dir: Path | None) -> str:
         data = self.to_data()
-        parts = [f"#### Сделка {index}"]
+        lines = [f"#### Сделка {index}"]
         for image_index, image in enumerate(data.images, start=1):
-            image_markdown_path = self._to_markdown_path(Path(image.image_path), base_dir)
-            alt_text = Path(image_markdown_path).stem or f"deal_{index}_{image_index}"
-            parts.append(f"![{alt_text}]({image_markdown_path})")
-        parts.extend(
-            [
-                f"**TF:** {data.timeframe}",
-                f"**Сценарий перехода:** {data.transition_ref}",
-                "",
-                f"**{_FIELD_DEFINITIONS[0][1]}**",
-                data.idea,
-                "",
-                f"**{_FIELD_DEFINITIONS[1][1]}**",
-                data.entry,
-                "",
-                f"**{_FIELD_DEFINITIONS[2][1]}**",
-                data.sl,
-                "",
-                f"**{_FIELD_DEFINITIONS[3][1]}**",
-                data.tp,
-            ]
+            image_markdown_path, alt_text = _markdown_image_target(image.image_path, base_dir)
+            alt_text = alt_text or f"deal_{index}_{image_index}"
+            lines.append(f"![{alt_text}]({image_markdown_path})")
+        lines.append(
+            f"**TF:** {data.timeframe}\n"
+            f"**Сценарий перехода:** {data.transition_ref}\n\n"
+            f"**{_FIELD_DEFINITIONS[0][1]}**\n{data.idea}\n\n"
+            f"**{_FIELD_DEFINITIONS[1][1]}**\n{data.entry}\n\n"
+            f"**{_FIELD_DEFINITIONS[2][1]}**\n{data.sl}\n\n"
+            f"**{_FIELD_DEFINITIONS[3][1]}**"
         )
-        return "\n".join(parts).strip()
+        # Fields are already stripped and the heading leads, so only an empty TP could leave a trailing newline.
+        if data.tp:
+            lines.append(data.tp)
+        return "\n".join(lines)
 
     def _on_transition_changed(self, _index: int) -> None:
         self._transition_ref = (self.transition_combo.currentData() or "").strip()
@@ -455,7 +546,7 @@ class DealScenarioWidget(QFrame):
             return
 
         self._add_image_widget(DealScenarioImageData(image_path=image_file))
-        self._update_image_titles()
+        self._update_image_titles(len(self._images) - 1)
         self.changed.emit()
 
     def _on_paste_image_clicked(self) -> None:
@@ -465,7 +556,7 @@ class DealScenarioWidget(QFrame):
             return
 
         self._add_image_widget(DealScenarioImageData(image_path=str(image_path)))
-        self._update_image_titles()
+        self._update_image_titles(len(self._images) - 1)
         self.changed.emit()
 
     def _add_image_widget(self, data: DealScenarioImageData) -> None:
@@ -477,18 +568,19 @@ class DealScenarioWidget(QFrame):
         self._images.append(widget)
         self._refresh_images_layout()
 
-    def _remove_image_widget(self, widget: QWidget) -> None:
-        if widget in self._images:
-            self._images.remove(widget)
+    def _remove_image_widget(self, widget: QWidget, position: int) -> None:
+        if not (0 <= position < len(self._images) and self._images[position] is widget):
+            return
+        del self._images[position]
         widget.setParent(None)
         widget.deleteLater()
         self._refresh_images_layout()
-        self._update_image_titles()
+        self._update_image_titles(position)
         self.changed.emit()
 
-    def _update_image_titles(self) -> None:
-        for index, image in enumerate(self._images, start=1):
-            image.set_index(index)
+    def _update_image_titles(self, start: int = 0) -> None:
+        for index in range(start, len(self._images)):
+            self._images[index].set_index(index + 1)
 
     def _refresh_images_layout(self) -> None:
         while self.images_layout.count():
@@ -499,15 +591,6 @@ class DealScenarioWidget(QFrame):
             col = index % 2
             self.images_layout.addWidget(image, row, col)
 
-    @staticmethod
-    def _to_markdown_path(path: Path, base_dir: Path | None) -> str:
-        if path.is_absolute() and base_dir:
-            try:
-                return path.relative_to(base_dir).as_posix()
-            except ValueError:
-                return path.as_posix()
-        return path.as_posix()
-
 
 class DealScenariosEditor(QWidget):
     content_changed = Signal()
@@ -548,6 +631,12 @@ class DealScenariosEditor(QWidget):
         self.entries_container.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
         root.addWidget(self.entries_container)
 
+        # Adding or removing cards within one event-loop turn is reported with a single content_changed.
+        self._content_changed_timer = QTimer(self)
+        self._content_changed_timer.setSingleShot(True)
+        self._content_changed_timer.setInterval(0)
+        self._content_changed_timer.timeout.connect(self.content_changed)
+
         self._update_empty_state()
 
     def set_base_directory(self, base_dir: Path | None) -> None:
@@ -563,29 +652,45 @@ class DealScenariosEditor(QWidget):
             entry.set_read_mode(read_mode)
 
     def set_transition_choices(self, choices: list[tuple[str, str]]) -> None:
+        # The workbench pushes choices on every transition edit; most edits do not change them.
+        if choices == self._transition_choices:
+            return
         self._transition_choices = choices
         for entry in self._entries:
             entry.set_transition_choices(choices)
 
     def append_entry(self, data: DealScenarioData) -> None:
         self._add_entry_widget(data)
-        self._update_entry_titles()
+        self._update_entry_titles(len(self._entries) - 1)
         self._update_empty_state()
         self.content_changed.emit()
 
     def load_from_markdown(self, markdown: str) -> None:
+        self._content_changed_timer.stop()
+        entries = self._parse_entries(markdown)
+        # Swap the whole list with painting off so the column is laid out once, not per card.
+        self.entries_container.setUpdatesEnabled(False)
         self._clear_entries()
-        for data in self._parse_entries(markdown):
+        for data in entries:
             self._add_entry_widget(data)
+        self.entries_container.setUpdatesEnabled(True)
         self._update_entry_titles()
         self._update_empty_state()
         self.content_changed.emit()
 
+    def flush_pending_changes(self) -> None:
+        if self._content_changed_timer.isActive():
+            self._content_changed_timer.stop()
+            self.content_changed.emit()
+
     def to_markdown(self) -> str:
-        chunks = [entry.to_markdown(index + 1, self._base_dir) for index, entry in enumerate(self._entries)]
-        return "\n\n---\n\n".join(chunks).strip()
+        self.flush_pending_changes()
+        return "\n\n---\n\n".join(
+            entry.to_markdown(index, self._base_dir) for index, entry in enumerate(self._entries, start=1)
+        )
 
     def validate_content(self) -> tuple[bool, str]:
+        self.flush_pending_changes()
         if not self._entries:
             return False, "В разделе сценариев сделок нужна минимум одна сделка."
 
@@ -617,9 +722,9 @@ class DealScenariosEditor(QWidget):
             return
 
         self._add_entry_widget(DealScenarioData(images=[DealScenarioImageData(image_path=image_file)]))
-        self._update_entry_titles()
+        self._update_entry_titles(len(self._entries) - 1)
         self._update_empty_state()
-        self.content_changed.emit()
+        self._content_changed_timer.start()
 
     def _on_paste_image_clicked(self) -> None:
         image_path = image_path_from_clipboard()
@@ -628,9 +733,9 @@ class DealScenariosEditor(QWidget):
             return
 
         self._add_entry_widget(DealScenarioData(images=[DealScenarioImageData(image_path=str(image_path))]))
-        self._update_entry_titles()
+        self._update_entry_titles(len(self._entries) - 1)
         self._update_empty_state()
-        self.content_changed.emit()
+        self._content_changed_timer.start()
 
     def _add_entry_widget(self, data: DealScenarioData) -> None:
         entry = DealScenarioWidget(data, self)
@@ -643,14 +748,15 @@ class DealScenariosEditor(QWidget):
         self.entries_layout.insertWidget(max(0, self.entries_layout.count() - 1), entry)
         self._entries.append(entry)
 
-    def _remove_entry_widget(self, widget: QWidget) -> None:
-        if widget in self._entries:
-            self._entries.remove(widget)
+    def _remove_entry_widget(self, widget: QWidget, position: int) -> None:
+        if not (0 <= position < len(self._entries) and self._entries[position] is widget):
+            return
+        del self._entries[position]
         widget.setParent(None)
         widget.deleteLater()
-        self._update_entry_titles()
+        self._update_entry_titles(position)
         self._update_empty_state()
-        self.content_changed.emit()
+        self._content_changed_timer.start()
 
     def _clear_entries(self) -> None:
         while self._entries:
@@ -658,9 +764,9 @@ class DealScenariosEditor(QWidget):
             widget.setParent(None)
             widget.deleteLater()
 
-    def _update_entry_titles(self) -> None:
-        for index, entry in enumerate(self._entries, start=1):
-            entry.set_index(index)
+    def _update_entry_titles(self, start: int = 0) -> None:
+        for index in range(start, len(self._entries)):
+            self._entries[index].set_index(index + 1)
 
     def _update_empty_state(self) -> None:
         is_empty = len(self._entries) == 0
@@ -684,18 +790,20 @@ class DealScenariosEditor(QWidget):
 
     @staticmethod
     def _split_deal_chunks(text: str) -> list[str]:
-        heading_matches = list(re.finditer(r"(?mi)^####\s+.+$", text))
-        if heading_matches:
+        heading_iter = _DEAL_HEADING_RE.finditer(text)
+        match = next(heading_iter, None)
+        if match is not None:
             chunks: list[str] = []
-            for index, match in enumerate(heading_matches):
-                start = match.start()
-                end = heading_matches[index + 1].start() if index + 1 < len(heading_matches) else len(text)
-                chunk = text[start:end].strip()
+            while match is not None:
+                next_match = next(heading_iter, None)
+                end = next_match.start() if next_match is not None else len(text)
+                chunk = text[match.start() : end].strip()
                 if chunk:
                     chunks.append(chunk)
+                match = next_match
             return chunks
 
-        split_chunks = [chunk.strip() for chunk in re.split(r"(?mi)^\s*---+\s*$", text) if chunk.strip()]
+        split_chunks = [chunk.strip() for chunk in _DEAL_SEPARATOR_SPLIT_RE.split(text) if chunk.strip()]
         return split_chunks if split_chunks else [text]
 
     @staticmethod
@@ -704,9 +812,13 @@ class DealScenariosEditor(QWidget):
         if not text:
             return None
 
-        images = [DealScenarioImageData(image_path=match.group(1).strip()) for match in _IMAGE_RE.finditer(text)]
+        images = (
+            [DealScenarioImageData(image_path=match.group(1).strip()) for match in _IMAGE_RE.finditer(text)]
+            if "![" in text
+            else []
+        )
 
-        timeframe_match = re.search(r"(?mi)^\s*(?:\*\*TF:\*\*|TF:)\s*(.+?)\s*$", text)
+        timeframe_match = _TIMEFRAME_RE.search(text)
         timeframe = timeframe_match.group(1).strip() if timeframe_match else ""
 
         transition_match = _TRANSITION_REF_RE.search(text)
@@ -714,11 +826,11 @@ class DealScenariosEditor(QWidget):
 
         fields = _extract_fields_by_headers(text)
         if all(not value for value in fields.values()):
-            body = re.sub(r"(?mi)^####\s+.+$", "", text)
+            body = _DEAL_HEADING_RE.sub("", text)
             body = _IMAGE_RE.sub("", body)
-            body = re.sub(r"(?mi)^\s*(?:\*\*TF:\*\*|TF:)\s*.+$", "", body)
-            body = re.sub(r"(?mi)^\*\*Сценарий перехода:\*\*.*$", "", body)
-            body = re.sub(r"(?mi)^---+\s*$", "", body)
+            body = _TIMEFRAME_LINE_RE.sub("", body)
+            body = _TRANSITION_LINE_RE.sub("", body)
+            body = _SEPARATOR_LINE_RE.sub("", body)
             fields["idea"] = body.strip()
 
         return DealScenarioData(
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+
+# Decodes can reach tens of MB each, so the cache is bounded by size; same budget as QPixmapCache.
+_CACHE_LIMIT_BYTES = 64 * 1024 * 1024
+# Previews never get wider than the window; decode huge screenshots straight at a smaller size.
+_MAX_DECODE_WIDTH = 2560
+
+
+class _ImageLoaderSignals(QObject):
+    # mtime_ns does not fit a 32-bit int, so it travels as a plain Python object.
+    image_loaded = Signal(str, object, QImage)
+
+
+class _ImageLoadTask(QRunnable):
+    def __init__(self, path: str, mtime_ns: int, signals: _ImageLoaderSignals) -> None:
+        super().__init__()
+        self._path = path
+        self._mtime_ns = mtime_ns
+        self._signals = signals
+
+    def run(self) -> None:
+        # QImage can be decoded off the GUI thread; QPixmap cannot.
+        reader = QImageReader(self._path)
+        size = reader.size()
+        if size.width() > _MAX_DECODE_WIDTH:
+            reader.setScaledSize(size.scaled(_MAX_DECODE_WIDTH, size.height(), Qt.AspectRatioMode.KeepAspectRatio))
+        self._signals.image_loaded.emit(self._path, self._mtime_ns, reader.read())
+
+
+class ImageLoader(QObject):
+    image_loaded = Signal(str, QImage)
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._signals = _ImageLoaderSignals(self)
+        self._signals.image_loaded.connect(self._on_image_loaded)
+        self._cache: OrderedDict[tuple[str, int], QImage] = OrderedDict()
+        self._cache_bytes = 0
+        self._pending: set[tuple[str, int]] = set()
+
+    def cached_image(self, path: Path) -> QImage | None:
+        key = self._cache_key(path)
+        if key is None:
+            return None
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+        return image
+
+    def request(self, path: Path) -> bool:
+        key = self._cache_key(path)
+        if key is None:
+            return False
+        # A file changed during a decode gets its own job; it must not join the one for the old version.
+        if key not in self._pending:
+            self._pending.add(key)
+            QThreadPool.globalInstance().start(_ImageLoadTask(key[0], key[1], self._signals))
+        return True
+
+    def _on_image_loaded(self, path: str, mtime_ns: int, image: QImage) -> None:
+        self._pending.discard((path, mtime_ns))
+        if not image.isNull():
+            self._store(path, mtime_ns, image)
+        # Waiting widgets only know the path; let a newer pending version answer them instead.
+        if any(pending_path == path for pending_path, _ in self._pending):
+            return
+        self.image_loaded.emit(path, image)
+
+    def _store(self, path: str, mtime_ns: int, image: QImage) -> None:
+        previous = self._cache.pop((path, mtime_ns), None)
+        if previous is not None:
+            self._cache_bytes -= previous.sizeInBytes()
+        self._cache[(path, mtime_ns)] = image
+        self._cache_bytes += image.sizeInBytes()
+        # The newest image always stays, even when it alone is over the budget.
+        while self._cache_bytes > _CACHE_LIMIT_BYTES and len(self._cache) > 1:
+            _key, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted.sizeInBytes()
+
+    @staticmethod
+    def _cache_key(path: Path) -> tuple[str, int] | None:
+        try:
+            return str(path), path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+
+_IMAGE_LOADER: ImageLoader | None = None
+
+
+def image_loader() -> ImageLoader:
+    global _IMAGE_LOADER
+    if _IMAGE_LOADER is None:
+        _IMAGE_LOADER = ImageLoader()
+    return _IMAGE_LOADER
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True, slots=True)
@@ -92,6 +93,7 @@ def get_theme_tokens(theme_name: str) -> ThemeTokens:
     return DARK_TOKENS
 
 
+@lru_cache(maxsize=2)
 def build_app_stylesheet(tokens: ThemeTokens) -> str:
     return f"""
     QWidget {{
@@ -28,7 +28,8 @@ from PySide6.QtWidgets import (
 from .current_situation import ELEMENT_OPTIONS, TIMEFRAME_OPTIONS
 from .image_clipboard import image_path_from_clipboard
 
-_IMAGE_RE = re.compile(r"!\[[^\]]*]\(([^)]+)\)")
+# Image links never span lines; bounded possessive runs keep a stray "![" from rescanning the rest of the text.
+_IMAGE_RE = re.compile(r"!\[[^\]\n]{0,512}+]\(([^)\n]{1,2048}+)\)")
 _MEANING_RE = re.compile(
     r"^(ADV|NOT[\s_]+ADV)\s+(BUY|SELL)\s+(UP|LOW|DOWN)\s+(.+)$",
     re.IGNORECASE,
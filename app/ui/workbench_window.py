@@ -40,8 +40,18 @@ from PySide6.QtWidgets import (
 )
 
 from ..core.autosave import AutoSaveController
-from ..core.plans import TradingPlan, apply_title_to_markdown
-from ..core.storage import PlanFileInfo, build_draft_path, list_markdown_files, read_markdown, save_markdown
+from ..core.plans import TradingPlan, apply_title_to_markdown, extract_title
+from ..core.storage import (
+    PlanFileInfo,
+    build_draft_path,
+    flush_pending_writes,
+    list_markdown_files,
+    read_markdown,
+    save_markdown,
+    release_draft_path,
+    save_markdown_in_background,
+    take_background_error,
+)
 from ..settings import (
     APP_NAME,
     LEGACY_PLANS_DIRECTORY_NAMES,
@@ -244,6 +254,7 @@ class MainWindow(QMainWindow):
 
         self.current_file: Path | None = None
         self.current_draft_path: Path | None = None
+        self._background_save_path: Path | None = None
         self.current_plan = TradingPlan.empty()
         self.file_cache: list[PlanFileInfo] = []
         self._updating = False
@@ -712,7 +723,10 @@ class MainWindow(QMainWindow):
                 self.theme_combo.setCurrentIndex(idx)
             self.theme_combo.blockSignals(False)
 
-        self.setStyleSheet(build_app_stylesheet(tokens))
+        stylesheet = build_app_stylesheet(tokens)
+        # setStyleSheet re-polishes the whole window, so skip it when the theme did not change.
+        if self.styleSheet() != stylesheet:
+            self.setStyleSheet(stylesheet)
         self._update_preview()
         if persist:
             self.settings.save()
@@ -805,6 +819,8 @@ class MainWindow(QMainWindow):
         target = path.with_name(f"{cleaned}.md")
         if target == path:
             return
+        if not self._flush_background_writes():
+            return
         if target.exists():
             QMessageBox.warning(self, "Переименование", "Файл с таким именем уже существует.")
             return
@@ -833,6 +849,8 @@ class MainWindow(QMainWindow):
         )
         if answer != QMessageBox.StandardButton.Yes:
             return
+        if not self._flush_background_writes():
+            return
         try:
             path.unlink(missing_ok=False)
         except OSError as exc:
@@ -1279,9 +1297,15 @@ class MainWindow(QMainWindow):
         raw_markdown = apply_title_to_markdown(self.raw_editor.toPlainText(), title)
         return raw_markdown, None
 
-    def _save_to_target(self, target: Path, markdown: str, explicit: bool) -> bool:
+    def _save_to_target(self, target: Path, markdown: str, explicit: bool, background: bool = False) -> bool:
         try:
-            save_markdown(target, markdown)
+            if background:
+                self._background_save_path = target
+                previous_error = save_markdown_in_background(target, markdown)
+                if previous_error is not None:
+                    raise previous_error
+            else:
+                save_markdown(target, markdown)
         except OSError as exc:
             self._set_autosave_status("Автосохранение: ошибка")
             self.statusBar().showMessage(f"Ошибка сохранения: {exc}", 7000)
@@ -1290,6 +1314,28 @@ class MainWindow(QMainWindow):
             return False
         return True
 
+    def _release_reserved_draft(self, path: Path) -> None:
+        release_draft_path(path)
+        if self.current_draft_path == path:
+            self.current_draft_path = None
+
+    def _flush_background_writes(self) -> bool:
+        # A queued autosave already cleared the dirty flag; only here do its failures come back.
+        if not flush_pending_writes():
+            self.autosave.mark_dirty()
+            self._set_autosave_status("Автосохранение: ошибка")
+            self.statusBar().showMessage("Ошибка сохранения: фоновая запись файла не завершилась вовремя", 7000)
+            return False
+        if self._background_save_path is None:
+            return True
+        error = take_background_error(self._background_save_path)
+        self._background_save_path = None
+        if error is not None:
+            self.autosave.mark_dirty()
+            self._set_autosave_status("Автосохранение: ошибка")
+            self.statusBar().showMessage(f"Ошибка сохранения: {error}", 7000)
+        return True
+
     @staticmethod
     def _sanitize_plan_folder_name(name: str) -> str:
         cleaned = re.sub(r"[\\/:*?\"<>|]+", "_", name).strip(". ")
@@ -1433,11 +1479,23 @@ class MainWindow(QMainWindow):
             widget.image_path = str(copied_path)
             widget._update_image_preview()
 
-    def _save_internal(self, explicit: bool, save_as: bool = False, autosave: bool = False) -> bool:
+    def _save_internal(
+        self,
+        explicit: bool,
+        save_as: bool = False,
+        autosave: bool = False,
+        background: bool = False,
+    ) -> bool:
         if not self._validate_image_text_rules(explicit=explicit):
             return False
+        if explicit and not self._flush_background_writes():
+            QMessageBox.critical(
+                self, "Ошибка сохранения", "Предыдущее автосохранение ещё не завершилось. Повторите попытку позже."
+            )
+            return False
 
         target_path: Path | None = None
+        reserved_draft = False
         if save_as:
             target_path = self._ask_save_path()
             if not target_path:
@@ -1462,6 +1520,7 @@ class MainWindow(QMainWindow):
             if target_path is None:
                 if self.current_draft_path is None:
                     self.current_draft_path = build_draft_path(self.current_directory)
+                    reserved_draft = True
                 target_path = self.current_draft_path
         elif explicit:
             target_path = self._ask_save_path()
@@ -1470,6 +1529,7 @@ class MainWindow(QMainWindow):
         else:
             if self.current_draft_path is None:
                 self.current_draft_path = build_draft_path(self.current_directory)
+                reserved_draft = True
             target_path = self.current_draft_path
 
         if target_path is None:
@@ -1514,6 +1574,8 @@ class MainWindow(QMainWindow):
                         "Ошибка копирования изображений",
                         f"Не удалось скопировать изображения плана:\n{exc}",
                     )
+                if reserved_draft:
+                    self._release_reserved_draft(target_path)
                 return False
             base_dir = target_path.parent if target_path else self._current_preview_base_dir()
             self.current_situation_editor.set_base_directory(base_dir)
@@ -1521,7 +1583,12 @@ class MainWindow(QMainWindow):
             self.deal_scenarios_editor.set_base_directory(base_dir)
         markdown, plan = self._compose_current_markdown()
 
-        if not self._save_to_target(target=target_path, markdown=markdown, explicit=explicit):
+        # Timer autosaves of an existing file go through the background writer so fsync never blocks typing.
+        # A freshly reserved draft is still an empty placeholder and is written right away.
+        background = background and not explicit and not reserved_draft and target_path.exists()
+        if not self._save_to_target(target=target_path, markdown=markdown, explicit=explicit, background=background):
+            if reserved_draft:
+                self._release_reserved_draft(target_path)
             return False
 
         if plan is not None:
@@ -1577,11 +1644,14 @@ class MainWindow(QMainWindow):
         if not self.autosave.dirty:
             return
         self._set_autosave_status("Автосохранение...")
-        ok = self._save_internal(explicit=False, save_as=False, autosave=True)
+        ok = self._save_internal(explicit=False, save_as=False, autosave=True, background=True)
         if not ok:
             self._set_autosave_status("Автосохранение: ошибка")
 
     def _ensure_saved_before_navigation(self) -> bool:
+        self.current_situation_editor.flush_pending_changes()
+        self.deal_scenarios_editor.flush_pending_changes()
+        self._flush_background_writes()
         if not self.autosave.dirty:
             return True
 
@@ -1846,8 +1916,7 @@ class MainWindow(QMainWindow):
 
         normalized = self._normalize_preview_markdown(markdown, hide_comments=True)
         normalized = self._strip_preview_notation_lines(normalized)
-        plan = TradingPlan.from_markdown(markdown, fallback_title="Trading Plan")
-        title = (plan.title.strip() or "Trading Plan").upper()
+        title = (extract_title(markdown, fallback="Trading Plan") or "Trading Plan").upper()
         normalized = re.sub(r"(?m)^\s*#\s+.+?\s*$", "", normalized, count=1).strip()
         normalized = self._move_tf_lines_above_images(normalized)
         body = self._markdown_to_body_html(self._prepare_inline_code_markdown(normalized))
@@ -1,4 +1,15 @@
-from app.ui.current_situation import notation_to_text
+from PySide6.QtWidgets import QApplication, QWidget
+
+from app.ui.current_situation import CurrentSituationEditor, notation_to_text
+
+
+def _layout_rows(editor: CurrentSituationEditor) -> list[list[QWidget]]:
+    rows: list[list[QWidget]] = []
+    for row_index in range(editor.entries_layout.count()):
+        row_layout = editor.entries_layout.itemAt(row_index).layout()
+        items = (row_layout.itemAt(index) for index in range(row_layout.count()))
+        rows.append([item.widget() for item in items if item.widget() is not None])
+    return rows
 
 
 def test_notation_to_text_in_success() -> None:
@@ -48,3 +59,34 @@ def test_notation_to_text_wrong_second_line() -> None:
     assert text is None
     assert error is not None
     assert "Actual/Prev +/- TF DR Premium/Equilibrium/Discount" in error
+
+
+def test_notation_to_text_accepts_optional_dr_and_any_case() -> None:
+    text, error = notation_to_text("in + h1 RB\nactual - h4 premium")
+    assert error is None
+    assert text is not None
+    assert "[+H1 RB]" in text
+    assert "Premium актуального [-H4 DR]" in text
+
+    text, error = notation_to_text("RANGE + H1 RB UP\nPrev - H4 XX Premium")
+    assert text is None
+    assert error is not None
+
+
+def test_situation_entries_stay_in_rows_of_two_after_add_and_remove(qapp: QApplication) -> None:
+    editor = CurrentSituationEditor()
+    editor.load_from_markdown("\n\n".join(f"![{index}]({index}.png)\n**TF:** h1" for index in range(1, 6)))
+    entries = list(editor._entries)
+    assert _layout_rows(editor) == [entries[0:2], entries[2:4], entries[4:5]]
+
+    entries[1].remove_button.click()
+    assert editor._entries == [entries[0], entries[2], entries[3], entries[4]]
+    assert _layout_rows(editor) == [[entries[0], entries[2]], [entries[3], entries[4]]]
+
+    entries[4].remove_button.click()
+    entries[0].remove_button.click()
+    assert _layout_rows(editor) == [[entries[2], entries[3]]]
+    assert [entry.title_label.text() for entry in editor._entries] == ["Картинка #1", "Картинка #2"]
+
+    editor.load_from_markdown("![a](a.png)\n**TF:** h1")
+    assert _layout_rows(editor) == [[editor._entries[0]]]
@@ -1,4 +1,17 @@
-from app.ui.deal_scenarios import DealScenariosEditor
+from PySide6.QtWidgets import QApplication
+
+from app.ui.deal_scenarios import DealScenarioData, DealScenarioImageData, DealScenariosEditor
+
+IDEA_HEADER = "**Идея сделки**"
+ENTRY_HEADER = "**Entry: почему именно так? Можно ли выгоднее? Обосновать**"
+SL_HEADER = "**SL: Почему именно так? Что он отменяет? Обосновать**"
+TP_HEADER = "**TP: Почему именно так? Это оптимальная цель? Обосновать**"
+
+
+def _round_trip(markdown: str) -> str:
+    editor = DealScenariosEditor()
+    editor.load_from_markdown(markdown)
+    return editor.to_markdown()
 
 
 def test_parse_deal_scenarios_markdown() -> None:
@@ -83,3 +96,144 @@ B
     assert len(entries) == 2
     assert entries[0].images[0].image_path == "a.png"
     assert entries[1].images[0].image_path == "b.png"
+
+
+def test_deal_round_trip_keeps_saved_block_unchanged(qapp: QApplication) -> None:
+    markdown = "\n".join(
+        [
+            "#### Сделка 1",
+            "![img1](img1.png)",
+            "![chart](charts/chart.png)",
+            "**TF:** m15",
+            "**Сценарий перехода:** GET + H1 OB ACTUAL - H4 DR Premium",
+            "",
+            IDEA_HEADER,
+            "Идея",
+            "",
+            ENTRY_HEADER,
+            "Entry rationale",
+            "",
+            SL_HEADER,
+            "SL rationale",
+            "",
+            TP_HEADER,
+            "TP rationale",
+        ]
+    )
+    assert _round_trip(markdown) == markdown
+
+
+def test_deal_round_trip_fills_empty_fields(qapp: QApplication) -> None:
+    markdown = f"#### Сделка 1\n![a](a.png)\n**TF:** h1\n\n{IDEA_HEADER}\nТолько идея\n"
+    expected = "\n".join(
+        [
+            "#### Сделка 1",
+            "![a](a.png)",
+            "**TF:** h1",
+            "**Сценарий перехода:** ",
+            "",
+            IDEA_HEADER,
+            "Только идея",
+            "",
+            ENTRY_HEADER,
+            "",
+            "",
+            SL_HEADER,
+            "",
+            "",
+            TP_HEADER,
+        ]
+    )
+    assert _round_trip(markdown) == expected
+
+
+def test_deal_round_trip_reorders_out_of_order_headers(qapp: QApplication) -> None:
+    markdown = (
+        f"#### Сделка 3\n![b](b.png)\n**TF:** h4\n\n{TP_HEADER}\nTP first\n\n"
+        f"{IDEA_HEADER}\nИдея\nв две строки\n\n{SL_HEADER}\nSL\n"
+    )
+    expected = "\n".join(
+        [
+            "#### Сделка 1",
+            "![b](b.png)",
+            "**TF:** h4",
+            "**Сценарий перехода:** ",
+            "",
+            IDEA_HEADER,
+            "Идея",
+            "в две строки",
+            "",
+            ENTRY_HEADER,
+            "",
+            "",
+            SL_HEADER,
+            "SL",
+            "",
+            TP_HEADER,
+            "TP first",
+        ]
+    )
+    assert _round_trip(markdown) == expected
+
+
+def test_deal_to_markdown_joins_deals_with_separator(qapp: QApplication) -> None:
+    editor = DealScenariosEditor()
+    editor.append_entry(
+        DealScenarioData(
+            images=[DealScenarioImageData(image_path="a.png")],
+            timeframe="h1",
+            transition_ref="CREATE + M5 FVG",
+            idea="A",
+            entry="E",
+            sl="S",
+            tp="T",
+        )
+    )
+    editor.append_entry(
+        DealScenarioData(
+            images=[DealScenarioImageData(image_path="b.png"), DealScenarioImageData(image_path="c.png")],
+            timeframe="m15",
+            idea="B",
+        )
+    )
+
+    expected = "\n".join(
+        [
+            "#### Сделка 1",
+            "![a](a.png)",
+            "**TF:** h1",
+            "**Сценарий перехода:** CREATE + M5 FVG",
+            "",
+            IDEA_HEADER,
+            "A",
+            "",
+            ENTRY_HEADER,
+            "E",
+            "",
+            SL_HEADER,
+            "S",
+            "",
+            TP_HEADER,
+            "T",
+            "",
+            "---",
+            "",
+            "#### Сделка 2",
+            "![b](b.png)",
+            "![c](c.png)",
+            "**TF:** m15",
+            "**Сценарий перехода:** ",
+            "",
+            IDEA_HEADER,
+            "B",
+            "",
+            ENTRY_HEADER,
+            "",
+            "",
+            SL_HEADER,
+            "",
+            "",
+            TP_HEADER,
+        ]
+    )
+    assert editor.to_markdown() == expected
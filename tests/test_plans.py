@@ -2,6 +2,7 @@ from app.core.plans import (
     SECTION_DEFINITIONS,
     TradingPlan,
     apply_title_to_markdown,
+    extract_title,
     find_first_image_without_text,
 )
 
@@ -75,3 +76,50 @@ def test_image_caption_validation_ok() -> None:
 def test_image_caption_validation_fails_when_missing_text() -> None:
     block = "![img](chart.png)\n\n![img2](chart2.png)\n"
     assert find_first_image_without_text(block) == 1
+
+
+def test_image_caption_validation_ignores_lines_with_more_than_one_link() -> None:
+    block = "![a](x.png) ![b](y.png)\n\n![b](y.png) и ещё текст (см. выше)\n"
+    assert find_first_image_without_text(block) is None
+
+
+def test_out_of_order_sections_fall_back_to_raw_mode() -> None:
+    markdown = """
+# План B
+
+## 2. Описание сценариев перехода к сделкам
+Блок 2
+
+## 1. Описание текущей ситуации
+Блок 1
+
+## 3. Описание сценариев сделок
+Блок 3
+""".strip()
+
+    plan = TradingPlan.from_markdown(markdown, fallback_title="Fallback")
+    assert plan.structured is False
+
+
+def test_apply_title_to_markdown_replaces_existing_title() -> None:
+    assert apply_title_to_markdown("# Старый\nТекст\n\n", "Новый") == "# Новый\nТекст\n"
+    assert apply_title_to_markdown("# Новый\nТекст\n", "Новый") == "# Новый\nТекст\n"
+    assert apply_title_to_markdown("# Старый\nТекст", r"C:\new") == "# C:\\new\nТекст\n"
+
+
+def test_apply_title_to_markdown_keeps_saved_plan_unchanged() -> None:
+    markdown = TradingPlan(title="План", block1="Блок 1", block2="Блок 2", block3="Блок 3").to_markdown()
+
+    assert apply_title_to_markdown(markdown, "План") is markdown
+    assert apply_title_to_markdown(markdown, "Другой") == markdown.replace("# План\n", "# Другой\n", 1)
+
+
+def test_extract_title_reads_heading_or_fallback() -> None:
+    assert extract_title("# План C\n\n## 1. Описание текущей ситуации\nТекст") == "План C"
+    assert extract_title("Без заголовка", fallback="Fallback") == "Fallback"
+
+    long_preamble = "Вступление\n" * 1000 + "# Поздний заголовок\n"
+    assert extract_title(long_preamble) == TradingPlan.from_markdown(long_preamble).title == "Поздний заголовок"
+
+    old_mac = "Вступление\r# Заголовок\rТекст\r"
+    assert extract_title(old_mac) == TradingPlan.from_markdown(old_mac).title == "Заголовок"
@@ -1,6 +1,14 @@
 from pathlib import Path
 
-from app.core.storage import list_markdown_files
+from app.core.storage import (
+    atomic_write_text,
+    flush_pending_writes,
+    list_markdown_files,
+    read_markdown,
+    save_markdown,
+    save_markdown_in_background,
+    take_background_error,
+)
 
 
 def test_list_markdown_files_includes_root_and_plans_subfolders(tmp_path: Path) -> None:
@@ -22,3 +30,57 @@ def test_list_markdown_files_includes_root_and_plans_subfolders(tmp_path: Path)
 def test_list_markdown_files_returns_empty_for_missing_directory(tmp_path: Path) -> None:
     missing = tmp_path / "missing"
     assert list_markdown_files(missing) == []
+
+
+def test_atomic_write_text_replaces_file_without_leftovers(tmp_path: Path) -> None:
+    target = tmp_path / "plan.md"
+    target.write_text("old\n", encoding="utf-8")
+
+    atomic_write_text(target, "# План\nновый текст\n")
+
+    assert target.read_bytes() == "# План\nновый текст\n".encode("utf-8")
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_read_markdown_strips_bom_and_falls_back_to_cp1251(tmp_path: Path) -> None:
+    with_bom = tmp_path / "bom.md"
+    with_bom.write_bytes("\ufeff# План\n".encode("utf-8"))
+    legacy = tmp_path / "legacy.md"
+    legacy.write_bytes("# План\n".encode("cp1251"))
+
+    assert read_markdown(with_bom) == "# План\n"
+    assert read_markdown(legacy) == "# План\n"
+
+
+def test_background_writes_keep_latest_text_per_path(tmp_path: Path) -> None:
+    target = tmp_path / "plan.md"
+    for index in range(20):
+        assert save_markdown_in_background(target, f"version {index}\n") is None
+
+    assert flush_pending_writes(timeout=5)
+    assert target.read_text(encoding="utf-8") == "version 19\n"
+    assert [path.name for path in tmp_path.iterdir()] == ["plan.md"]
+
+
+def test_background_write_error_is_kept_until_taken(tmp_path: Path) -> None:
+    blocker = tmp_path / "blocker"
+    blocker.write_text("", encoding="utf-8")
+    target = blocker / "plan.md"
+
+    assert save_markdown_in_background(target, "text\n") is None
+    assert flush_pending_writes(timeout=5)
+    assert isinstance(take_background_error(target), OSError)
+    assert take_background_error(target) is None
+
+
+def test_save_markdown_discards_stale_background_error(tmp_path: Path) -> None:
+    target = tmp_path / "plan.md"
+    target.mkdir()
+    assert save_markdown_in_background(target, "text\n") is None
+    assert flush_pending_writes(timeout=5)
+    target.rmdir()
+
+    save_markdown(target, "text\n")
+
+    assert take_background_error(target) is None
+    assert target.read_text(encoding="utf-8") == "text\n"